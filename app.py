@@ -32,6 +32,13 @@ if "ref_form_key" not in st.session_state:
 if "job_form_key" not in st.session_state:
     st.session_state.job_form_key = 0
 
+# Adding keys for resetting table edits after a save
+if "jobs_table_key" not in st.session_state:
+    st.session_state.jobs_table_key = 0
+
+if "ref_table_key" not in st.session_state:
+    st.session_state.ref_table_key = 0
+
 tab1, tab2, tab3, tab4 = st.tabs(
     [
         "🗂 Master Resume",
@@ -1,14 +1,27 @@
 import os
+import json
+import sqlite3
 import pandas as pd
+from contextlib import closing
+from datetime import date, timedelta
 
 # ── Constants ──────────────────────────────────────────────────────────────────
 data_dir = "data"
 resume_dir = os.path.join(data_dir, "resumes")
 master_resume_docx_path = os.path.join(resume_dir, "master_resume.docx")
 master_resume_pdf_path = os.path.join(resume_dir, "master_resume.pdf")
+master_resume_txt_path = os.path.join(resume_dir, "master_resume.txt")
 tailored_dir = os.path.join(resume_dir, "tailored")
+master_versions_dir = os.path.join(resume_dir, "masters")
+artifacts_dir = os.path.join(resume_dir, "artifacts")
+render_cache_dir = os.path.join(resume_dir, "cache")
 jobs_csv = os.path.join(data_dir, "jobs.csv")
 referrals_csv = os.path.join(data_dir, "referrals.csv")
+job_stats_json = os.path.join(data_dir, "job_stats.json")
+jobs_fts_db = os.path.join(data_dir, "jobs_fts.db")
+row_ids_json = os.path.join(data_dir, "row_ids.json")
+exports_dir = os.path.join(data_dir, "exports")
+fetch_cache_dir = os.path.join(data_dir, "fetch_cache")
 
 # ── Exports ──────────────────────────────────────────────────────────────────
 
@@ -31,14 +44,32 @@ JOB_DATA_COLUMNS = [
     "resume_path",
     "url",
 ]
+
+REFERRAL_DATA_COLUMNS = [
+    "id",
+    "company",
+    "referral_name",
+    "contact at",
+    "notes",
+]
+
 PATHS = {
     "DATA_DIR": data_dir,
     "RESUME_DIR": resume_dir,
     "MASTER_RESUME_DOCX_PATH": master_resume_docx_path,
     "MASTER_RESUME_PDF_PATH": master_resume_pdf_path,
+    "MASTER_RESUME_TXT_PATH": master_resume_txt_path,
     "TAILORED_DIR": tailored_dir,
+    "MASTER_VERSIONS_DIR": master_versions_dir,
+    "ARTIFACTS_DIR": artifacts_dir,
+    "RENDER_CACHE_DIR": render_cache_dir,
     "JOBS_CSV": jobs_csv,
     "REFERRALS_CSV": referrals_csv,
+    "JOB_STATS_JSON": job_stats_json,
+    "JOBS_FTS_DB": jobs_fts_db,
+    "ROW_IDS_JSON": row_ids_json,
+    "EXPORTS_DIR": exports_dir,
+    "FETCH_CACHE_DIR": fetch_cache_dir,
 }
 
 
@@ -53,34 +84,581 @@ def config():
     # 3. Make tailored directory
     os.makedirs(tailored_dir, exist_ok=True)
 
+    # 4. Make tailored resume artifact store directories
+    os.makedirs(master_versions_dir, exist_ok=True)
+    os.makedirs(artifacts_dir, exist_ok=True)
+    os.makedirs(render_cache_dir, exist_ok=True)
+
+    # 5. Make exports directory
+    os.makedirs(exports_dir, exist_ok=True)
+
+    # 6. Make job description fetch cache directory
+    os.makedirs(fetch_cache_dir, exist_ok=True)
+
+
+# Parsed tables are kept in memory and only re-read when the file changes
+_table_cache: dict[str, tuple[tuple[int, int], pd.DataFrame]] = {}
+
+
+def _read_table(path: str, parse, copy: bool = True) -> pd.DataFrame:
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _table_cache.get(path)
+    if cached is None or cached[0] != version:
+        cached = (version, parse(pd.read_csv(path)))
+        _table_cache[path] = cached
+    # Read-only queries skip the copy, since filtering already builds a new frame
+    return cached[1].copy() if copy else cached[1]
+
+
+def _parse_jobs(jobs_df: pd.DataFrame) -> pd.DataFrame:
+    jobs_df["date_added"] = pd.to_datetime(jobs_df["date_added"], errors="coerce")
+    jobs_df["date_added"] = jobs_df["date_added"].apply(lambda x: x.date())
+    return jobs_df.fillna("")
+
+
+def _parse_referrals(referrals_df: pd.DataFrame) -> pd.DataFrame:
+    # Older referral files have no id column, so assign stable row ids once
+    if "id" not in referrals_df.columns:
+        referrals_df.insert(0, "id", range(1, len(referrals_df) + 1))
+    return referrals_df.fillna("")
+
 
 def load_jobs():
     if os.path.exists(jobs_csv):
-        jobs_df = pd.read_csv(jobs_csv)
-        jobs_df["date_added"] = pd.to_datetime(jobs_df["date_added"], errors="coerce")
-        jobs_df["date_added"] = jobs_df["date_added"].apply(lambda x: x.date())
+        jobs_df = _read_table(jobs_csv, _parse_jobs)
     else:
         jobs_df = pd.DataFrame(columns=JOB_DATA_COLUMNS)
 
-    jobs_df = jobs_df.fillna("")
     return jobs_df
 
 
 def load_referrals():
     if os.path.exists(referrals_csv):
-        referrals_df = pd.read_csv(referrals_csv)
+        referrals_df = _read_table(referrals_csv, _parse_referrals)
     else:
-        referrals_df = pd.DataFrame(
-            columns=["company", "referral_name", "contact at", "notes"]
-        )
-    referrals_df = referrals_df.fillna("")
+        referrals_df = pd.DataFrame(columns=REFERRAL_DATA_COLUMNS)
 
     return referrals_df
 
 
+def _cached_jobs() -> pd.DataFrame:
+    if not os.path.exists(jobs_csv):
+        return pd.DataFrame(columns=JOB_DATA_COLUMNS)
+    return _read_table(jobs_csv, _parse_jobs, copy=False)
+
+
+def _cached_referrals() -> pd.DataFrame:
+    if not os.path.exists(referrals_csv):
+        return pd.DataFrame(columns=REFERRAL_DATA_COLUMNS)
+    return _read_table(referrals_csv, _parse_referrals, copy=False)
+
+
 def save_jobs(df: pd.DataFrame):
     df.to_csv(jobs_csv, index=False)
 
 
 def save_referrals(df: pd.DataFrame):
     df.to_csv(referrals_csv, index=False)
+
+
+def get_artifact_path(job_id: int) -> str:
+    """Path of the tailored resume artifact stored for a job."""
+    return os.path.join(artifacts_dir, f"{int(job_id):03d}.json")
+
+
+# ── Row ids ──────────────────────────────────────────────────────────────────
+def _load_row_ids() -> dict:
+    if not os.path.exists(row_ids_json):
+        return {}
+    with open(row_ids_json) as f:
+        return json.load(f)
+
+
+def _reserve_ids(table: str, df: pd.DataFrame, count: int) -> list[int]:
+    """
+    Hand out new row ids above every id the table has ever used.
+
+    A high-water mark per table is kept in row_ids.json, so deleting the newest row never
+    frees its id for reuse; job ids also key tailored resumes, aggregates and the search index.
+
+    Args:
+        table (str): Table name, e.g. "jobs" or "referrals".
+        df (pd.DataFrame): The stored table, in case it holds ids above the mark.
+        count (int): Number of ids to reserve.
+
+    Returns:
+        list[int]: The reserved ids, ascending.
+    """
+    if count <= 0:
+        return []
+    row_ids = _load_row_ids()
+    current_max = int(pd.to_numeric(df["id"]).max()) if not df.empty else 0
+    next_id = max(row_ids.get(table, 0), current_max) + 1
+    row_ids[table] = next_id + count - 1
+    with open(row_ids_json, "w") as f:
+        json.dump(row_ids, f)
+    return list(range(next_id, next_id + count))
+
+
+# ── Row-level edits ──────────────────────────────────────────────────────────
+def get_row_changes(editor_state: dict, row_ids: list) -> dict:
+    """
+    Translate a st.data_editor edit state into changes keyed by stable row id.
+
+    The editor reports edited and deleted rows by their position in the frame it
+    was given, so positions are mapped back through row_ids (the ids of the
+    displayed rows, in display order).
+
+    Args:
+        editor_state (dict): The editor's session state with edited_rows, added_rows and deleted_rows.
+        row_ids (list): Row ids of the displayed frame, in display order.
+
+    Returns:
+        dict: {"edited": {id: {column: value}}, "added": [row dicts], "deleted": [ids]}
+    """
+    edited = {
+        row_ids[int(pos)]: values
+        for pos, values in editor_state.get("edited_rows", {}).items()
+    }
+    added = [
+        {column: value for column, value in row.items() if column != "_index"}
+        for row in editor_state.get("added_rows", [])
+    ]
+    deleted = [row_ids[int(pos)] for pos in editor_state.get("deleted_rows", [])]
+
+    return {"edited": edited, "added": added, "deleted": deleted}
+
+
+def apply_row_changes(
+    df: pd.DataFrame,
+    changes: dict,
+    table: str,
+    columns: list[str],
+    defaults: dict | None = None,
+) -> tuple[pd.DataFrame, list[int]]:
+    """
+    Apply id-keyed row changes to a dataframe, touching only the changed rows.
+
+    Args:
+        df (pd.DataFrame): The full stored dataframe with an "id" column.
+        changes (dict): Changes as returned by get_row_changes.
+        table (str): Table name, used to reserve ids for added rows.
+        columns (list[str]): Column order of the stored table.
+        defaults (dict | None): Values for columns missing from added rows.
+
+    Returns:
+        tuple[pd.DataFrame, list[int]]: The updated dataframe and the ids given to added rows.
+    """
+    # Reserve against the table before deletions so freed ids are never handed out again
+    added_ids = _reserve_ids(table, df, len(changes["added"]))
+    df = df.set_index("id", drop=False)
+
+    if changes["deleted"]:
+        df = df.drop(index=changes["deleted"], errors="ignore")
+
+    for row_id, values in changes["edited"].items():
+        if row_id not in df.index:
+            continue
+        for column, value in values.items():
+            if column in df.columns:
+                df.at[row_id, column] = "" if value is None else value
+
+    if changes["added"]:
+        new_rows = []
+        for row_id, row in zip(added_ids, changes["added"]):
+            new_row = {column: "" for column in columns}
+            new_row.update(defaults or {})
+            new_row.update({k: v for k, v in row.items() if v is not None})
+            new_row["id"] = row_id
+            new_rows.append(new_row)
+        df = pd.concat([df, pd.DataFrame(new_rows, columns=columns)])
+
+    return df.reset_index(drop=True)[columns], added_ids
+
+
+# ── Paginated queries ────────────────────────────────────────────────────────
+def _sort_key(column: pd.Series) -> pd.Series:
+    if column.name == "date_added":
+        return pd.to_datetime(column, errors="coerce")
+    if column.name == "id":
+        return pd.to_numeric(column, errors="coerce")
+    return column.astype(str).str.lower()
+
+
+def paginate(
+    df: pd.DataFrame,
+    sort_by: str,
+    ascending: bool = True,
+    page: int = 1,
+    page_size: int = 50,
+) -> pd.DataFrame:
+    """
+    Sort a query result and cut out one page, so only that page reaches the editor.
+
+    Args:
+        df (pd.DataFrame): Matching rows, e.g. from select_jobs or select_referrals.
+        sort_by (str): Column to sort by.
+        ascending (bool): Sort direction.
+        page (int): 1-based page number.
+        page_size (int): Number of rows per page.
+
+    Returns:
+        pd.DataFrame: The requested page.
+    """
+    df = df.sort_values(sort_by, ascending=ascending, key=_sort_key, kind="stable")
+    start = (max(page, 1) - 1) * page_size
+    return df.iloc[start : start + page_size]
+
+
+def _filter_jobs(
+    jobs_df: pd.DataFrame,
+    statuses: list[str] | None,
+    companies: list[str] | None,
+    date_range: tuple[date, date] | None,
+) -> pd.DataFrame:
+    mask = pd.Series(True, index=jobs_df.index)
+    if statuses:
+        mask &= jobs_df["status"].isin(statuses)
+    if companies:
+        mask &= jobs_df["company"].isin(companies)
+    if date_range:
+        start, end = (pd.Timestamp(d) for d in date_range)
+        dates = pd.to_datetime(jobs_df["date_added"], errors="coerce")
+        mask &= (dates >= start) & (dates <= end)
+    return jobs_df[mask]
+
+
+def select_jobs(
+    statuses: list[str] | None = None,
+    companies: list[str] | None = None,
+    date_range: tuple[date, date] | None = None,
+) -> pd.DataFrame:
+    """
+    Return every stored job matching the given filters in a single pass over the table.
+
+    The caller derives both the match count (len) and the displayed page (paginate) from
+    this one result.
+
+    Args:
+        statuses (list[str] | None): Keep only jobs with one of these statuses.
+        companies (list[str] | None): Keep only jobs at one of these companies.
+        date_range (tuple[date, date] | None): Inclusive (start, end) range on date_added.
+
+    Returns:
+        pd.DataFrame: The matching jobs.
+    """
+    return _filter_jobs(_cached_jobs(), statuses, companies, date_range)
+
+
+def _search_referrals(referrals_df: pd.DataFrame, search: str) -> pd.DataFrame:
+    if not search:
+        return referrals_df
+    mask = pd.Series(False, index=referrals_df.index)
+    for column in referrals_df.columns.drop("id"):
+        mask |= (
+            referrals_df[column].astype(str).str.contains(search, case=False, regex=False)
+        )
+    return referrals_df[mask]
+
+
+def select_referrals(search: str = "") -> pd.DataFrame:
+    """
+    Return every stored referral matching a search in a single pass over the table.
+
+    Args:
+        search (str): Case-insensitive text matched against every column.
+
+    Returns:
+        pd.DataFrame: The matching referrals.
+    """
+    return _search_referrals(_cached_referrals(), search)
+
+
+def _rows_by_id(df: pd.DataFrame, ids: list) -> list[dict]:
+    return df[df["id"].isin(ids)].to_dict("records")
+
+
+def add_job(job: dict) -> int:
+    return add_jobs([job])[0]
+
+
+def add_jobs(jobs: list[dict]) -> list[int]:
+    """
+    Insert many jobs with a single write of the jobs table, aggregates and search index.
+
+    Jobs without an "id" are given new ids above every id ever used.
+
+    Args:
+        jobs (list[dict]): Job rows keyed by JOB_DATA_COLUMNS.
+
+    Returns:
+        list[int]: The ids of the inserted jobs.
+    """
+    jobs_df = load_jobs()
+    stats = load_job_stats()
+    sync_jobs_fts()
+
+    new_ids = iter(
+        _reserve_ids("jobs", jobs_df, sum(job.get("id", "") == "" for job in jobs))
+    )
+    rows = []
+    for job in jobs:
+        row = {column: job.get(column, "") for column in JOB_DATA_COLUMNS}
+        if row["id"] == "":
+            row["id"] = next(new_ids)
+        rows.append(row)
+
+    jobs_df = pd.concat([jobs_df, pd.DataFrame(rows)], ignore_index=True)
+    save_jobs(jobs_df)
+    for row in rows:
+        _count_job(stats, row, 1)
+    _save_job_stats(stats)
+    _index_jobs(rows)
+
+    return [row["id"] for row in rows]
+
+
+def update_jobs(changes: dict):
+    jobs_df = load_jobs()
+    stats = load_job_stats()
+    sync_jobs_fts()
+
+    # Aggregates are adjusted by removing the old rows and adding the new ones
+    edited_ids = list(changes["edited"].keys())
+    old_rows = _rows_by_id(jobs_df, edited_ids + changes["deleted"])
+
+    jobs_df, added_ids = apply_row_changes(
+        jobs_df,
+        changes,
+        "jobs",
+        JOB_DATA_COLUMNS,
+        defaults={"status": JOB_STATUSES[0], "date_added": date.today()},
+    )
+    save_jobs(jobs_df)
+
+    new_rows = _rows_by_id(jobs_df, edited_ids + added_ids)
+    for row in old_rows:
+        _count_job(stats, row, -1)
+    for row in new_rows:
+        _count_job(stats, row, 1)
+    _save_job_stats(stats)
+    _index_jobs(new_rows, deleted_ids=changes["deleted"])
+
+    # Tailored resumes are keyed by job id, so they go with their job
+    for job_id in changes["deleted"]:
+        artifact_path = get_artifact_path(job_id)
+        if os.path.exists(artifact_path):
+            os.remove(artifact_path)
+
+
+def add_referral(referral: dict) -> int:
+    """
+    Insert one referral under a new id.
+
+    Args:
+        referral (dict): Referral row keyed by REFERRAL_DATA_COLUMNS (without an id).
+
+    Returns:
+        int: The id of the inserted referral.
+    """
+    referrals_df = load_referrals()
+    (referral_id,) = _reserve_ids("referrals", referrals_df, 1)
+    row = {column: referral.get(column, "") for column in REFERRAL_DATA_COLUMNS}
+    row["id"] = referral_id
+    referrals_df = pd.concat([referrals_df, pd.DataFrame([row])], ignore_index=True)
+    save_referrals(referrals_df)
+    return referral_id
+
+
+def update_referrals(changes: dict):
+    referrals_df = load_referrals()
+    referrals_df, _ = apply_row_changes(
+        referrals_df, changes, "referrals", REFERRAL_DATA_COLUMNS
+    )
+    save_referrals(referrals_df)
+
+
+# ── Dashboard aggregates ─────────────────────────────────────────────────────
+def _jobs_version() -> list[int] | None:
+    if not os.path.exists(jobs_csv):
+        return None
+    stat = os.stat(jobs_csv)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _count_job(stats: dict, job: dict, delta: int):
+    """Add (delta=1) or remove (delta=-1) one job from every aggregate bucket."""
+    keys = {
+        "by_status": str(job.get("status", "")),
+        "by_company": str(job.get("company", "")),
+    }
+
+    day = str(job.get("date_added", ""))[:10]
+    try:
+        added = date.fromisoformat(day)
+        keys["by_day"] = day
+        keys["by_week"] = str(added - timedelta(days=added.weekday()))
+    except ValueError:
+        pass
+
+    for bucket, key in keys.items():
+        count = stats[bucket].get(key, 0) + delta
+        if count > 0:
+            stats[bucket][key] = count
+        else:
+            stats[bucket].pop(key, None)
+
+
+def rebuild_job_stats() -> dict:
+    """
+    Recompute the dashboard aggregates from scratch and persist them.
+
+    Only needed when job_stats.json is missing or jobs.csv was changed outside the app;
+    normal inserts and edits keep the aggregates up to date incrementally.
+
+    Returns:
+        dict: The rebuilt aggregates.
+    """
+    stats = {"by_status": {}, "by_day": {}, "by_week": {}, "by_company": {}}
+    for job in load_jobs().to_dict("records"):
+        _count_job(stats, job, 1)
+    _save_job_stats(stats)
+    return stats
+
+
+def load_job_stats() -> dict:
+    """
+    Load the maintained job aggregates: counts by status, day, ISO week (keyed by the
+    Monday) and company.
+
+    Returns:
+        dict: {"by_status": {...}, "by_day": {...}, "by_week": {...}, "by_company": {...}}
+    """
+    if os.path.exists(job_stats_json):
+        with open(job_stats_json) as f:
+            stats = json.load(f)
+        if stats.get("jobs_version") == _jobs_version():
+            return stats
+
+    return rebuild_job_stats()
+
+
+def _save_job_stats(stats: dict):
+    # Stamp the aggregates with the jobs file they describe to detect outside edits
+    stats["jobs_version"] = _jobs_version()
+    with open(job_stats_json, "w") as f:
+        json.dump(stats, f)
+
+
+def get_job_funnel(stats: dict) -> dict:
+    """
+    Derive the Applied → Interview → Offer funnel from the status counts.
+
+    A job counts as having reached a stage if its current status is that stage or a later one.
+
+    Args:
+        stats (dict): Aggregates from load_job_stats.
+
+    Returns:
+        dict: Stage counts and the stage-to-stage conversion rates (0-1).
+    """
+    by_status = stats["by_status"]
+    applied = sum(by_status.values())
+    offers = by_status.get("Offer", 0)
+    interviews = by_status.get("Interview", 0) + offers
+
+    return {
+        "applied": applied,
+        "interviews": interviews,
+        "offers": offers,
+        "interview_rate": interviews / applied if applied else 0.0,
+        "offer_rate": offers / interviews if interviews else 0.0,
+    }
+
+
+# ── Full-text search ─────────────────────────────────────────────────────────
+def _connect_jobs_fts() -> sqlite3.Connection:
+    conn = sqlite3.connect(jobs_fts_db)
+    conn.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts "
+        "USING fts5(company, title, description, tokenize='porter unicode61')"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    return conn
+
+
+def _stamp_jobs_fts(conn: sqlite3.Connection):
+    # Stamp the index with the jobs file it describes to detect outside edits
+    conn.execute(
+        "INSERT OR REPLACE INTO meta VALUES ('jobs_version', ?)",
+        (json.dumps(_jobs_version()),),
+    )
+
+
+def _index_jobs(rows: list[dict], deleted_ids: list | None = None):
+    """Upsert the given job rows into the search index and remove deleted ones."""
+    stale_ids = [int(row["id"]) for row in rows] + [int(i) for i in deleted_ids or []]
+    with closing(_connect_jobs_fts()) as conn, conn:
+        conn.executemany(
+            "DELETE FROM jobs_fts WHERE rowid = ?", [(i,) for i in stale_ids]
+        )
+        conn.executemany(
+            "INSERT INTO jobs_fts (rowid, company, title, description) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    int(row["id"]),
+                    str(row.get("company", "")),
+                    str(row.get("title", "")),
+                    str(row.get("description", "")),
+                )
+                for row in rows
+            ],
+        )
+        _stamp_jobs_fts(conn)
+
+
+def sync_jobs_fts():
+    """
+    Rebuild the job search index if it is missing or jobs.csv was changed outside the app.
+
+    Normal inserts and edits keep the index up to date incrementally.
+    """
+    with closing(_connect_jobs_fts()) as conn, conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'jobs_version'").fetchone()
+        if row is not None and json.loads(row[0]) == _jobs_version():
+            return
+        conn.execute("DELETE FROM jobs_fts")
+
+    _index_jobs(load_jobs().to_dict("records"))
+
+
+def search_jobs(query: str, limit: int = 20) -> pd.DataFrame:
+    """
+    Ranked full-text search over job company, title and description.
+
+    Supports FTS5 query syntax (e.g. "kubernetes AND visa", "data NOT analyst", "machine*");
+    a query that is not valid FTS5 syntax is searched as a plain phrase.
+
+    Args:
+        query (str): Search query.
+        limit (int): Maximum number of results.
+
+    Returns:
+        pd.DataFrame: Columns id, company, title and snippet, best match first. Matched
+        terms in snippet are wrapped in \x02 ... \x03 markers.
+    """
+    sync_jobs_fts()
+    sql = (
+        "SELECT rowid, company, title, "
+        "snippet(jobs_fts, 2, char(2), char(3), '…', 24) "
+        "FROM jobs_fts WHERE jobs_fts MATCH ? ORDER BY rank LIMIT ?"
+    )
+    with closing(_connect_jobs_fts()) as conn:
+        try:
+            rows = conn.execute(sql, (query, limit)).fetchall()
+        except sqlite3.OperationalError:
+            phrase = '"' + query.replace('"', '""') + '"'
+            rows = conn.execute(sql, (phrase, limit)).fetchall()
+
+    return pd.DataFrame(rows, columns=["id", "company", "title", "snippet"])
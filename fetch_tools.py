@@ -0,0 +1,225 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import PATHS
+from ingest_tools import parse_posting_html, clean_text
+
+# Loading config constants
+FETCH_CACHE_DIR = PATHS["FETCH_CACHE_DIR"]
+
+# Concurrency and politeness limits
+FETCH_WORKERS = 8
+DOMAIN_CONCURRENCY = 2
+DOMAIN_DELAY = 1.0
+REQUEST_TIMEOUT = 15
+
+# Cached pages younger than this are used without contacting the server at all
+CACHE_FRESH_SECONDS = 24 * 60 * 60
+
+USER_AGENT = "Mozilla/5.0 (compatible; ResumeTailor/1.0; personal job tracker)"
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=FETCH_WORKERS,
+        pool_maxsize=FETCH_WORKERS,
+        max_retries=Retry(
+            total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+# One pooled session is shared so connections to the same host are reused
+SESSION = _build_session()
+
+
+class _DomainLimiter:
+    """Cap concurrent requests per domain and space out their start times."""
+
+    def __init__(self, concurrency: int, delay: float):
+        self.concurrency = concurrency
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+
+    def __call__(self, domain: str):
+        with self._lock:
+            slot = self._slots.setdefault(
+                domain, threading.Semaphore(self.concurrency)
+            )
+        return _DomainSlot(self, domain, slot)
+
+    def _wait_turn(self, domain: str):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(domain, now))
+            self._next_start[domain] = start + self.delay
+        time.sleep(max(start - now, 0))
+
+
+class _DomainSlot:
+    def __init__(self, limiter: _DomainLimiter, domain: str, slot: threading.Semaphore):
+        self.limiter = limiter
+        self.domain = domain
+        self.slot = slot
+
+    def __enter__(self):
+        self.slot.acquire()
+        self.limiter._wait_turn(self.domain)
+
+    def __exit__(self, *exc):
+        self.slot.release()
+
+
+_domain_limiter = _DomainLimiter(DOMAIN_CONCURRENCY, DOMAIN_DELAY)
+
+
+def _cache_path(url: str) -> str:
+    name = hashlib.sha256(url.encode()).hexdigest()[:32]
+    return os.path.join(FETCH_CACHE_DIR, f"{name}.json")
+
+
+def _load_cached(url: str) -> dict | None:
+    path = _cache_path(url)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_cached(url: str, entry: dict):
+    # Write then rename so concurrent readers never see a partial file
+    path = _cache_path(url)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+
+def fetch_page(url: str, session: requests.Session | None = None) -> tuple[str, bool]:
+    """
+    Fetch a page through the on-disk cache, revalidating with ETag/Last-Modified.
+
+    If revalidating a stale cached page fails (network error or error status), the stale
+    copy is served rather than failing.
+
+    Args:
+        url (str): Page URL.
+        session (requests.Session | None): Session to use; defaults to the shared pooled one.
+
+    Returns:
+        tuple[str, bool]: The page body and whether it was served from the cache.
+
+    Raises:
+        requests.RequestException: If the request fails and the page was never cached.
+    """
+    session = session or SESSION
+    cached = _load_cached(url)
+    if cached and time.time() - cached["fetched_at"] < CACHE_FRESH_SECONDS:
+        return cached["body"], True
+
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        with _domain_limiter(urlparse(url).netloc):
+            response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code != 304:
+            response.raise_for_status()
+    except requests.RequestException:
+        if cached:
+            return cached["body"], True
+        raise
+
+    if response.status_code == 304 and cached:
+        cached["fetched_at"] = time.time()
+        _save_cached(url, cached)
+        return cached["body"], True
+
+    _save_cached(
+        url,
+        {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "body": response.text,
+        },
+    )
+    return response.text, False
+
+
+def fetch_job_description(url: str, session: requests.Session | None = None) -> dict:
+    """
+    Fetch a job posting URL and extract its title, company and description.
+
+    Args:
+        url (str): Job posting URL.
+        session (requests.Session | None): Session to use; defaults to the shared pooled one.
+
+    Returns:
+        dict: {"url", "title", "company", "description", "from_cache", "error"}; error is
+        None on success and a message if the page could not be fetched.
+    """
+    url = url.strip()
+    posting = {
+        "url": url,
+        "title": "",
+        "company": "",
+        "description": "",
+        "from_cache": False,
+        "error": None,
+    }
+    try:
+        page, posting["from_cache"] = fetch_page(url, session)
+    except requests.RequestException as e:
+        posting["error"] = f"Could not fetch {url}: {e}"
+        return posting
+
+    parsed = parse_posting_html(page)
+    posting["title"] = parsed["title"]
+    posting["company"] = parsed["company"]
+    posting["description"] = clean_text(parsed["description"])
+    return posting
+
+
+def fetch_job_descriptions(
+    urls: list[str], session: requests.Session | None = None
+) -> list[dict]:
+    """
+    Fetch many job posting URLs concurrently, within the per-domain politeness limits.
+
+    Duplicate and blank URLs are dropped.
+
+    Args:
+        urls (list[str]): Job posting URLs.
+        session (requests.Session | None): Session to use; defaults to the shared pooled one.
+
+    Returns:
+        list[dict]: Postings as returned by fetch_job_description, in input order.
+    """
+    unique_urls = list(dict.fromkeys(u.strip() for u in urls if u.strip()))
+    if not unique_urls:
+        return []
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        return list(
+            executor.map(lambda u: fetch_job_description(u, session), unique_urls)
+        )
@@ -0,0 +1,271 @@
+import os
+import re
+import hashlib
+import zipfile
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+from docx import Document
+
+POSTING_EXTENSIONS = {".html", ".htm", ".pdf", ".txt", ".docx"}
+
+# Tags whose text is page chrome rather than the posting itself
+_SKIPPED_TAGS = {
+    "script",
+    "style",
+    "noscript",
+    "nav",
+    "header",
+    "footer",
+    "svg",
+    "form",
+}
+_BLOCK_TAGS = {
+    "p",
+    "div",
+    "li",
+    "br",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "tr",
+    "section",
+}
+
+# Separators between job title, company and site name in page titles and file names
+_TITLE_SPLIT_RE = re.compile(r"\s+(?:[-–—|·]|at|@)\s+", re.IGNORECASE)
+_JOB_SITES = {"linkedin", "indeed", "glassdoor", "greenhouse", "lever", "workday"}
+
+
+class _PostingHTMLParser(HTMLParser):
+    """Collect the visible text, page title and Open Graph metadata of an HTML posting."""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.meta = {}
+        self.page_title = ""
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "meta" and attrs.get("property", "").startswith("og:"):
+            self.meta[attrs["property"]] = attrs.get("content") or ""
+        elif tag == "link" and attrs.get("rel") == "canonical":
+            self.meta.setdefault("og:url", attrs.get("href") or "")
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.page_title += data
+        elif not self._skip_depth:
+            self.parts.append(data)
+
+
+def clean_text(text: str) -> str:
+    lines = (re.sub(r"[ \t\xa0]+", " ", line).strip() for line in text.splitlines())
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _split_title(text: str) -> tuple[str, str]:
+    """Guess (title, company) from strings like "Data Scientist - Acme | LinkedIn"."""
+    parts = [p.strip() for p in _TITLE_SPLIT_RE.split(text) if p.strip()]
+    parts = [p for p in parts if p.lower() not in _JOB_SITES]
+    if not parts:
+        return "", ""
+    return parts[0], parts[1] if len(parts) > 1 else ""
+
+
+def parse_posting_html(page: str) -> dict:
+    """
+    Extract the main text, title, company and canonical URL of an HTML job posting.
+
+    Args:
+        page (str): HTML source.
+
+    Returns:
+        dict: {"title", "company", "description", "url"}; the description is not yet cleaned.
+    """
+    parser = _PostingHTMLParser()
+    parser.feed(page)
+
+    title, company = _split_title(parser.meta.get("og:title") or parser.page_title)
+    site_name = parser.meta.get("og:site_name", "")
+    if not company and site_name.lower() not in _JOB_SITES:
+        company = site_name
+
+    return {
+        "title": title,
+        "company": company,
+        "description": "".join(parser.parts),
+        "url": parser.meta.get("og:url", ""),
+    }
+
+
+def parse_posting(path: str) -> dict:
+    """
+    Extract a job posting's text, title, company and URL from a saved file.
+
+    Runs in a worker process, so it only takes and returns plain, picklable values.
+
+    Args:
+        path (str): Path to an .html/.htm, .pdf, .txt or .docx file.
+
+    Returns:
+        dict: {"file", "title", "company", "description", "url", "error"}; error is None on
+        success and a message if the file could not be read.
+    """
+    posting = {
+        "file": os.path.basename(path),
+        "title": "",
+        "company": "",
+        "description": "",
+        "url": "",
+        "error": None,
+    }
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if ext in (".html", ".htm"):
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                posting.update(parse_posting_html(f.read()))
+        elif ext == ".pdf":
+            with fitz.open(path) as doc:
+                posting["description"] = "\n".join(page.get_text() for page in doc)
+        elif ext == ".docx":
+            posting["description"] = "\n".join(
+                p.text for p in Document(path).paragraphs
+            )
+        else:
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                posting["description"] = f.read()
+    except Exception as e:
+        posting["error"] = f"Could not read {posting['file']}: {e}"
+        return posting
+
+    posting["description"] = clean_text(posting["description"])
+
+    # Fall back to the file name, e.g. "Data Scientist - Acme.pdf"
+    if not posting["title"]:
+        stem = os.path.splitext(posting["file"])[0].replace("_", " ")
+        posting["title"], posting["company"] = _split_title(stem)
+
+    return posting
+
+
+def collect_posting_files(directory: str) -> list[str]:
+    """
+    List the supported posting files under a directory, recursively.
+
+    Args:
+        directory (str): Directory to scan.
+
+    Returns:
+        list[str]: Sorted file paths.
+
+    Raises:
+        FileNotFoundError: If directory does not exist.
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Directory not found: {directory}")
+
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if os.path.splitext(name)[1].lower() in POSTING_EXTENSIONS:
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def extract_posting_zip(zip_file, destination: str) -> list[str]:
+    """
+    Extract the supported posting files from a zip archive.
+
+    Each entry is written by its file name alone into its own numbered subdirectory, so
+    paths inside the archive cannot escape destination and equal names do not collide.
+
+    Args:
+        zip_file: Path or file-like object of the zip archive.
+        destination (str): Directory to extract into.
+
+    Returns:
+        list[str]: Paths of the extracted files.
+    """
+    paths = []
+    with zipfile.ZipFile(zip_file) as archive:
+        for i, info in enumerate(archive.infolist()):
+            name = os.path.basename(info.filename)
+            ext = os.path.splitext(name)[1].lower()
+            if info.is_dir() or ext not in POSTING_EXTENSIONS:
+                continue
+            entry_dir = os.path.join(destination, f"{i:04d}")
+            os.makedirs(entry_dir, exist_ok=True)
+            path = os.path.join(entry_dir, name)
+            with archive.open(info) as src, open(path, "wb") as dst:
+                dst.write(src.read())
+            paths.append(path)
+    return paths
+
+
+def parse_postings(paths: list[str], max_workers: int | None = None) -> list[dict]:
+    """
+    Extract many postings in parallel in a process pool.
+
+    Args:
+        paths (list[str]): Posting file paths.
+        max_workers (int | None): Number of worker processes (defaults to the CPU count).
+
+    Returns:
+        list[dict]: Parsed postings as returned by parse_posting, in the order of paths.
+    """
+    if not paths:
+        return []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(parse_posting, paths, chunksize=8))
+
+
+def description_fingerprint(description: str) -> str:
+    """Hash a description ignoring case and whitespace, for duplicate detection."""
+    normalized = " ".join(str(description).lower().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def dedupe_postings(postings: list[dict], existing_descriptions) -> list[dict]:
+    """
+    Drop postings that failed to parse, are empty, or duplicate an existing or earlier one.
+
+    Args:
+        postings (list[dict]): Parsed postings.
+        existing_descriptions: Descriptions of the jobs already stored.
+
+    Returns:
+        list[dict]: The new, unique postings.
+    """
+    seen = {description_fingerprint(d) for d in existing_descriptions if d}
+    unique = []
+    for posting in postings:
+        if posting["error"] or not posting["description"]:
+            continue
+        fingerprint = description_fingerprint(posting["description"])
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        unique.append(posting)
+    return unique
@@ -0,0 +1,235 @@
+import re
+import json
+
+# Field name -> accepted types, used to validate parsed LLM responses
+SCORE_SCHEMA = {
+    "score": (int, float),
+    "scoreRationale": str,
+    "keywordGaps": list,
+    "visaSponsorship": bool,
+}
+CHANGE_SCHEMA = {
+    "original": str,
+    "rewritten": str,
+}
+
+# How many truncation points to try when repairing cut-off JSON
+MAX_REPAIR_ATTEMPTS = 50
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_VALUE_START_RE = re.compile(r"[{\[]")
+_DECODER = json.JSONDecoder()
+
+
+def _strip_fences(text: str) -> str:
+    """Return the body of the first markdown code fence, or the text itself."""
+    match = _FENCE_RE.search(text)
+    return match.group(1) if match else text
+
+
+def _scan(text: str) -> tuple[list[str], bool, list[int]]:
+    """
+    Walk JSON text tracking strings and brackets.
+
+    Returns:
+        tuple[list[str], bool, list[int]]: The closers still open (innermost last), whether
+        the text ends inside a string, and the positions of commas outside strings.
+    """
+    closers, commas = [], []
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "[{":
+            closers.append("]" if ch == "[" else "}")
+        elif ch in "]}":
+            if closers:
+                closers.pop()
+        elif ch == ",":
+            commas.append(i)
+    return closers, in_string, commas
+
+
+def _close(text: str) -> str:
+    """Close an unterminated string and any open brackets at the end of text."""
+    closers, in_string, _ = _scan(text)
+    if in_string:
+        text += '"'
+    text = re.sub(r"[\s,:]+$", "", text)
+    return text + "".join(reversed(closers))
+
+
+def _decode_complete(text: str) -> tuple[bool, object]:
+    """
+    Find the largest complete JSON object or array in text, ignoring any prose around it.
+
+    Returns:
+        tuple[bool, object]: Whether a value was found, and the value.
+    """
+    found, best, best_len = False, None, 0
+    decoded_to = 0
+    for match in _VALUE_START_RE.finditer(text):
+        start = match.start()
+        if start < decoded_to:
+            # Inside a value that was already decoded whole
+            continue
+        try:
+            value, end = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            continue
+        decoded_to = end
+        if end - start > best_len:
+            found, best, best_len = True, value, end - start
+    return found, best
+
+
+def repair_json(text: str):
+    """
+    Parse JSON that may be truncated or carry trailing commas.
+
+    Text after a complete value is ignored. Otherwise open strings and brackets are closed;
+    if that is not enough, the text is cut back to each earlier top-level-or-nested comma in
+    turn so an incomplete last item is dropped.
+
+    Args:
+        text (str): JSON text, possibly cut off mid-value.
+
+    Returns:
+        The parsed value.
+
+    Raises:
+        ValueError: If no repair produces valid JSON.
+    """
+    text = _TRAILING_COMMA_RE.sub(r"\1", text.strip())
+    try:
+        return _DECODER.raw_decode(text)[0]
+    except json.JSONDecodeError:
+        pass
+
+    candidates = [text] + [
+        text[:pos] for pos in reversed(_scan(text)[2][-MAX_REPAIR_ATTEMPTS:])
+    ]
+    for candidate in candidates:
+        try:
+            return json.loads(_TRAILING_COMMA_RE.sub(r"\1", _close(candidate)))
+        except json.JSONDecodeError:
+            continue
+    raise ValueError("Could not repair JSON in LLM response")
+
+
+def parse_llm_json(text: str):
+    """
+    Parse an LLM response as JSON, tolerating fences, surrounding prose and truncation.
+
+    A complete value is taken as is, whatever text surrounds it; truncation repair is only
+    used when no value in the response is complete.
+
+    Args:
+        text (str): Raw LLM response.
+
+    Returns:
+        The parsed value (dict or list).
+
+    Raises:
+        ValueError: If no JSON value can be recovered.
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    body = _strip_fences(text)
+    found, value = _decode_complete(body)
+    if found:
+        return value
+
+    starts = [m.start() for m in _VALUE_START_RE.finditer(body)]
+    if not starts:
+        raise ValueError("No JSON found in LLM response")
+
+    # Repair from each opening bracket in turn, since earlier ones may be prose
+    for start in starts[:MAX_REPAIR_ATTEMPTS]:
+        try:
+            return repair_json(body[start:])
+        except ValueError:
+            continue
+    raise ValueError("Could not repair JSON in LLM response")
+
+
+def _coerce(value, expected):
+    """Coerce common LLM type slips (numeric strings, "True"/"False" strings)."""
+    if expected is bool and isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "yes"):
+            return True
+        if lowered in ("false", "no"):
+            return False
+    if expected == (int, float) and isinstance(value, str):
+        try:
+            return float(value.strip().rstrip("%"))
+        except ValueError:
+            return value
+    return value
+
+
+def validate_object(data, schema: dict) -> tuple[dict, list[str]]:
+    """
+    Keep the schema fields of a parsed object that have the expected type.
+
+    Args:
+        data: Parsed JSON value.
+        schema (dict): Field name -> accepted type(s).
+
+    Returns:
+        tuple[dict, list[str]]: The valid fields and the names of missing or invalid ones.
+    """
+    if not isinstance(data, dict):
+        return {}, list(schema)
+
+    valid, missing = {}, []
+    for field, expected in schema.items():
+        value = _coerce(data.get(field), expected)
+        if isinstance(value, expected) and not (
+            expected != bool and isinstance(value, bool)
+        ):
+            valid[field] = value
+        else:
+            missing.append(field)
+    return valid, missing
+
+
+def validate_list(data, schema: dict) -> list[dict]:
+    """
+    Unwrap a parsed response into a list of objects and keep only the valid ones.
+
+    Accepts a bare list, an object wrapping the list under any key (e.g. {"changes": [...]}),
+    or a single object.
+
+    Args:
+        data: Parsed JSON value.
+        schema (dict): Field name -> accepted type(s) for each item.
+
+    Returns:
+        list[dict]: Items that have every schema field with the expected type.
+    """
+    if isinstance(data, dict):
+        wrapped = [v for v in data.values() if isinstance(v, list)]
+        data = wrapped[0] if wrapped else [data]
+    if not isinstance(data, list):
+        return []
+
+    items = []
+    for item in data:
+        valid, missing = validate_object(item, schema)
+        if not missing:
+            # Keep extra fields such as a bullet id alongside the validated ones
+            items.append({**item, **valid})
+    return items
@@ -0,0 +1,158 @@
+import time
+import threading
+
+from langchain_core.prompts import ChatPromptTemplate
+
+# Weight of the newest call in the moving average latency
+LATENCY_SMOOTHING = 0.3
+
+# A failed model is tried after the healthy ones for this many seconds, doubling with each
+# consecutive failure up to the maximum, so a transient error does not demote it for good
+FAILURE_COOLDOWN = 60.0
+MAX_FAILURE_COOLDOWN = 15 * 60.0
+
+
+def model_name(model) -> str:
+    """Best-effort display name of a LangChain chat model."""
+    return (
+        getattr(model, "model_name", None)
+        or getattr(model, "model", None)
+        or getattr(model, "name", None)
+        or type(model).__name__
+    )
+
+
+class ModelRouter:
+    """
+    Route prompts to tiers of interchangeable chat models and learn from each call.
+
+    A tier is an ordered list of LangChain chat models (any Runnable that returns a message,
+    so a local stub such as FakeListChatModel works too). Within a tier, models are tried
+    by configured price, then lowest moving average latency, with models that failed
+    recently moved behind the rest until their cooldown runs out; a failing model falls
+    through to the next one in the tier.
+
+    Args:
+        tiers (dict[str, list]): Tier name -> chat models, e.g. {"fast": [...], "strong": [...]}.
+        costs (dict[str, float] | None): Model name -> USD per million tokens, for ranking
+            and cost stats; unlisted models count as free.
+    """
+
+    def __init__(self, tiers: dict[str, list], costs: dict[str, float] | None = None):
+        self.tiers = tiers
+        self.costs = costs or {}
+        self._stats = {}
+        # Model name -> (consecutive failures, monotonic time the cooldown ends)
+        self._cooldowns = {}
+        self._lock = threading.Lock()
+
+    def _model_stats(self, name: str) -> dict:
+        return self._stats.setdefault(
+            name,
+            {
+                "calls": 0,
+                "errors": 0,
+                "avg_latency": 0.0,
+                "tokens": 0,
+                "cost": 0.0,
+            },
+        )
+
+    def _record(self, name: str, latency: float, tokens: int, error: bool):
+        with self._lock:
+            stats = self._model_stats(name)
+            stats["calls"] += 1
+            if error:
+                stats["errors"] += 1
+                failures = self._cooldowns.get(name, (0, 0.0))[0] + 1
+                cooldown = min(
+                    FAILURE_COOLDOWN * 2 ** (failures - 1), MAX_FAILURE_COOLDOWN
+                )
+                self._cooldowns[name] = (failures, time.monotonic() + cooldown)
+                return
+            self._cooldowns.pop(name, None)
+            if stats["calls"] - stats["errors"] == 1:
+                stats["avg_latency"] = latency
+            else:
+                stats["avg_latency"] += LATENCY_SMOOTHING * (
+                    latency - stats["avg_latency"]
+                )
+            stats["tokens"] += tokens
+            stats["cost"] += tokens * self.costs.get(name, 0.0) / 1_000_000
+
+    def ranked(self, tier: str) -> list:
+        """
+        Order a tier's models by price and speed, with recently failed models last.
+
+        Models in cooldown are ordered by when their cooldown ends. Among models with the
+        same price, untried ones come first so they get measured.
+
+        Args:
+            tier (str): Tier name.
+
+        Returns:
+            list: The tier's models, best candidate first.
+        """
+        if tier not in self.tiers:
+            raise ValueError(f"Unknown model tier: {tier}")
+
+        now = time.monotonic()
+        with self._lock:
+            cooldowns = dict(self._cooldowns)
+            latencies = {name: s["avg_latency"] for name, s in self._stats.items()}
+
+        def key(model):
+            name = model_name(model)
+            cooldown_end = cooldowns.get(name, (0, 0.0))[1]
+            return (
+                cooldown_end if cooldown_end > now else 0.0,
+                self.costs.get(name, 0.0),
+                latencies.get(name, 0.0),
+            )
+
+        return sorted(self.tiers[tier], key=key)
+
+    def invoke(self, tier: str, template: str, variables: dict) -> str:
+        """
+        Run a prompt on the best model of a tier, falling through to the next on failure.
+
+        Args:
+            tier (str): Tier name.
+            template (str): ChatPromptTemplate template string.
+            variables (dict): Template variables.
+
+        Returns:
+            str: The model's text response.
+
+        Raises:
+            RuntimeError: If every model in the tier failed.
+        """
+        prompt = ChatPromptTemplate.from_template(template)
+        errors = []
+        for model in self.ranked(tier):
+            name = model_name(model)
+            start = time.perf_counter()
+            try:
+                message = (prompt | model).invoke(variables)
+            except Exception as e:
+                self._record(name, time.perf_counter() - start, 0, error=True)
+                errors.append(f"{name}: {e}")
+                continue
+
+            usage = getattr(message, "usage_metadata", None) or {}
+            self._record(
+                name, time.perf_counter() - start, usage.get("total_tokens", 0), False
+            )
+            return message.content
+
+        raise RuntimeError(f"All models in tier '{tier}' failed: {'; '.join(errors)}")
+
+    def stats(self) -> dict:
+        """
+        Snapshot of per-model call counts, errors, average latency (s), tokens and cost (USD).
+
+        Returns:
+            dict: Model name -> stats dict.
+        """
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
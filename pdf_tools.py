@@ -1,11 +1,19 @@
 import os
+import copy
 import base64
 import shutil
+import tempfile
+import threading
 import pythoncom
+from functools import lru_cache
 from docx.shared import RGBColor
 from docx2pdf import convert
 from docx import Document
 
+# docx2pdf drives a single Word instance (COM/JXA) and quits it after each conversion,
+# so conversions from concurrent render threads must not overlap
+_convert_lock = threading.Lock()
+
 
 def display_pdf(pdf_path: str) -> str:
     """
@@ -52,7 +60,8 @@ def docx_to_pdf(docx_path: str, output_pdf_path: str) -> str:
 
     try:
         pythoncom.CoInitialize()
-        convert(docx_path, output_pdf_path)
+        with _convert_lock:
+            convert(docx_path, output_pdf_path)
     except Exception as e:
         raise RuntimeError(f"PDF conversion failed: {e}")
     finally:
@@ -119,19 +128,23 @@ def _replace_text_in_runs(paragraph, original: str, rewritten: str):
         run.text = ""
 
 
-def apply_changes_to_docx(
-    docx_path: str,
-    changes: list[dict],
-) -> str:
+@lru_cache(maxsize=4)
+def _parse_docx(docx_path: str, mtime_ns: int):
+    return Document(docx_path)
+
+
+def clone_docx(docx_path: str):
     """
-    Apply LLM-suggested bullet rewrites to a .docx resume, preserving formatting.
+    Return an in-memory copy of a .docx document, parsing the file only once.
+
+    The parsed document is cached per path and modification time, so repeated calls for the
+    same master resume skip both the disk read and the XML parse.
 
     Args:
-        docx_path (str): Path to the master resume .docx.
-        changes (list[dict]): List of {original, rewritten} dicts from the LLM.
+        docx_path (str): Path to the source .docx file.
 
     Returns:
-        str: Path to the saved output .docx file.
+        Document: A python-docx Document that can be edited without touching the cached one.
 
     Raises:
         FileNotFoundError: If docx_path does not exist.
@@ -139,7 +152,21 @@ def apply_changes_to_docx(
     if not os.path.exists(docx_path):
         raise FileNotFoundError(f"Source .docx not found: {docx_path}")
 
-    doc = Document(docx_path)
+    return copy.deepcopy(_parse_docx(docx_path, os.stat(docx_path).st_mtime_ns))
+
+
+def apply_changes_to_document(doc, changes: list[dict]):
+    """
+    Apply LLM-suggested bullet rewrites to an in-memory document, preserving formatting.
+
+    Args:
+        doc (Document): A python-docx Document, edited in place.
+        changes (list[dict]): List of {original, rewritten} dicts from the LLM.
+    """
+    # Index paragraphs by text once instead of scanning them for every change
+    paragraphs = {}
+    for paragraph in doc.paragraphs:
+        paragraphs.setdefault(paragraph.text.strip(), []).append(paragraph)
 
     for change in changes:
         original = change.get("original", "").strip()
@@ -147,12 +174,118 @@ def apply_changes_to_docx(
         if not original or not rewritten:
             continue
 
-        for paragraph in doc.paragraphs:
-            para_text = paragraph.text.strip()
+        # Exact match, each paragraph rewritten at most once
+        matches = paragraphs.get(original)
+        if matches:
+            _replace_text_in_runs(matches.pop(0), original, rewritten)
+
+
+def document_to_pdf(doc, output_pdf_path: str) -> str:
+    """
+    Convert an in-memory python-docx Document to PDF.
+
+    docx2pdf drives Word/LibreOffice and can only read from a path, so the document is
+    saved straight into a single file in the system temp directory, which is always removed
+    afterwards.
+
+    Args:
+        doc (Document): The document to convert.
+        output_pdf_path (str): Destination path for the output PDF.
+
+    Returns:
+        str: Path to the saved PDF file.
+
+    Raises:
+        RuntimeError: If the conversion fails.
+    """
+    fd, docx_path = tempfile.mkstemp(suffix=".docx")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            doc.save(f)
+        docx_to_pdf(docx_path, output_pdf_path)
+    finally:
+        os.remove(docx_path)
 
-            # Exact match
-            if original == para_text:
-                _replace_text_in_runs(paragraph, original, rewritten)
-                break
+    return output_pdf_path
 
-    doc.save(docx_path)
+
+def get_paragraphs(docx_path: str) -> list[str]:
+    """
+    Collect the stripped text of every non-empty paragraph in a .docx file, in document order.
+
+    Args:
+        docx_path (str): Path to the .docx file.
+
+    Returns:
+        list[str]: Paragraph texts, as matched by apply_changes_to_document.
+
+    Raises:
+        FileNotFoundError: If docx_path does not exist.
+    """
+    if not os.path.exists(docx_path):
+        raise FileNotFoundError(f"Source .docx not found: {docx_path}")
+
+    doc = _parse_docx(docx_path, os.stat(docx_path).st_mtime_ns)
+    return [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+
+
+def _is_list_paragraph(paragraph) -> bool:
+    """Whether a paragraph is a list item, via direct numbering, its style or a List style."""
+    p_pr = paragraph._p.pPr
+    if p_pr is not None and p_pr.numPr is not None:
+        return True
+
+    style = paragraph.style
+    while style is not None:
+        if style.name.startswith("List"):
+            return True
+        s_pr = style.element.pPr
+        if s_pr is not None and s_pr.numPr is not None:
+            return True
+        style = style.base_style
+    return False
+
+
+def get_paragraph_outline(docx_path: str) -> list[dict]:
+    """
+    Describe every non-empty paragraph in a .docx file, in document order.
+
+    Args:
+        docx_path (str): Path to the .docx file.
+
+    Returns:
+        list[dict]: {"text", "style", "list_item"} per paragraph, aligned with get_paragraphs;
+        list_item is True for bulleted or numbered paragraphs (w:numPr or a List style).
+
+    Raises:
+        FileNotFoundError: If docx_path does not exist.
+    """
+    if not os.path.exists(docx_path):
+        raise FileNotFoundError(f"Source .docx not found: {docx_path}")
+
+    doc = _parse_docx(docx_path, os.stat(docx_path).st_mtime_ns)
+    return [
+        {
+            "text": p.text.strip(),
+            "style": p.style.name if p.style is not None else "",
+            "list_item": _is_list_paragraph(p),
+        }
+        for p in doc.paragraphs
+        if p.text.strip()
+    ]
+
+
+def get_paragraph_texts(docx_path: str) -> set[str]:
+    """
+    Collect the stripped text of every non-empty paragraph in a .docx file.
+
+    Args:
+        docx_path (str): Path to the .docx file.
+
+    Returns:
+        set[str]: Paragraph texts, as matched by apply_changes_to_document.
+
+    Raises:
+        FileNotFoundError: If docx_path does not exist.
+    """
+    return set(get_paragraphs(docx_path))
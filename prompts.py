@@ -22,16 +22,20 @@ resume_score_prompt = """
 resume_tailor_prompt = """
         You are an expert resume coach. Analyze a resume against a job description.
 
-        You must respond with ONLY a valid JSON object array. No introduction, no explanation, no markdown, no text before or after the JSON.
+        You must respond with ONLY a valid JSON object. No introduction, no explanation, no markdown, no text before or after the JSON.
         
         Structure of response:
-        [
         {{
-            "original": "...",
-            "rewritten": "..."
-        }}
+        "changes": [
+            {{
+                "id": <bullet id>,
+                "original": "...",
+                "rewritten": "..."
+            }}
         ]
+        }}
 
+        Bullets in the resume are prefixed with an id in square brackets, e.g. [12]. Only rewrite those bullets, return their id in "id", and copy the original text without the id prefix.
         Include 3-6 of the most impactful bullet rewrites. Keep rewrites truthful to the original — enhance language, don't fabricate experience.
 
         Resume context:
@@ -40,3 +44,20 @@ resume_tailor_prompt = """
         Job Description context:
         {jd_context}
 """
+
+resume_score_reask_prompt = """
+        You are an expert resume coach. A previous analysis of this resume against this job description was incomplete.
+        You must respond with ONLY a valid JSON object containing exactly these fields: {missing_fields}. No other fields, no text before or after the JSON.
+
+        Field definitions:
+        "score": <number 0-100>
+        "scoreRationale": "<1-2 sentence explanation>"
+        "keywordGaps": ["keyword1", "keyword2", ...]
+        "visaSponsorship": <true or false>, false only if the job description explicitly mentions no visa sponsorship
+
+        Resume context:
+        {resume_context}
+
+        Job Description context:
+        {jd_context}
+"""
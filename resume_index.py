@@ -0,0 +1,198 @@
+import re
+import math
+from collections import Counter
+
+# Paragraphs matching these (case-insensitive) start a new resume section
+SECTION_HEADINGS = {
+    "summary",
+    "profile",
+    "objective",
+    "experience",
+    "work experience",
+    "professional experience",
+    "employment",
+    "education",
+    "skills",
+    "technical skills",
+    "projects",
+    "publications",
+    "certifications",
+    "awards",
+    "leadership",
+    "volunteering",
+    "activities",
+}
+
+# Leading characters of bullets typed by hand instead of through Word list numbering
+BULLET_GLYPHS = ("•", "●", "▪", "◦", "‣", "■", "–", "-", "*")
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+
+def tokenize(text: str) -> list[str]:
+    return [t.rstrip(".-") for t in _TOKEN_RE.findall(text.lower())]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _is_heading(paragraph: dict, in_body: bool, first: bool) -> bool:
+    text = paragraph["text"]
+    if text.strip().rstrip(":").lower() in SECTION_HEADINGS:
+        return True
+    if paragraph.get("list_item"):
+        return False
+    # The name at the top is often styled as a heading or written in capitals
+    if paragraph.get("style", "").startswith("Heading"):
+        return not first
+    return in_body and text.isupper() and len(text.split()) <= 4
+
+
+def _is_glyph_bullet(text: str) -> bool:
+    return text[:1] in BULLET_GLYPHS and text[1:2].isspace()
+
+
+def build_resume_index(paragraphs: list[dict]) -> dict:
+    """
+    Split resume paragraphs into header, sections, context lines and bullets, and index the
+    bullets for BM25 retrieval.
+
+    Bullets are the list paragraphs (Word bullets or numbering, or a leading bullet
+    character); the other body paragraphs are role/date/company context lines. A resume
+    with no list markup at all has every body paragraph treated as a bullet, so nothing
+    is left out of tailoring.
+
+    Args:
+        paragraphs (list[dict]): Non-empty resume paragraphs in document order, each with
+            text and, optionally, style (paragraph style name) and list_item, as returned
+            by pdf_tools.get_paragraph_outline.
+
+    Returns:
+        dict: {"header": [...], "items": [...], "bullet_ids": [...], "standalone_ids": [...],
+        "idf": {...}, "avg_len": float} where standalone_ids are context lines with no bullets
+        under them (e.g. skills or education lines), and each item has id (paragraph index),
+        text, section, kind ("heading", "context" or "bullet"), context (id of the preceding
+        context line or None) and, for bullets, tokens.
+    """
+    header, items = [], []
+    section, context_id = None, None
+    marked = [p.get("list_item") or _is_glyph_bullet(p["text"]) for p in paragraphs]
+    has_list_markup = any(marked)
+
+    for idx, paragraph in enumerate(paragraphs):
+        text = paragraph["text"]
+        if _is_heading(paragraph, in_body=section is not None, first=idx == 0):
+            section, context_id = text, None
+            items.append({"id": idx, "text": text, "section": section, "kind": "heading"})
+        elif section is None:
+            # Name, contact details and links before the first section heading
+            header.append(text)
+        elif has_list_markup and not marked[idx]:
+            context_id = idx
+            items.append({"id": idx, "text": text, "section": section, "kind": "context"})
+        else:
+            items.append(
+                {
+                    "id": idx,
+                    "text": text,
+                    "section": section,
+                    "kind": "bullet",
+                    "context": context_id,
+                    "tokens": Counter(tokenize(text)),
+                }
+            )
+
+    bullets = [item for item in items if item["kind"] == "bullet"]
+    referenced = {item["context"] for item in bullets}
+    standalone_ids = [
+        item["id"]
+        for item in items
+        if item["kind"] == "context" and item["id"] not in referenced
+    ]
+    doc_freq = Counter(token for item in bullets for token in item["tokens"])
+    n = len(bullets)
+    idf = {
+        token: math.log(1 + (n - df + 0.5) / (df + 0.5)) for token, df in doc_freq.items()
+    }
+    avg_len = sum(sum(item["tokens"].values()) for item in bullets) / n if n else 0.0
+
+    return {
+        "header": header,
+        "items": items,
+        "bullet_ids": [item["id"] for item in bullets],
+        "standalone_ids": standalone_ids,
+        "idf": idf,
+        "avg_len": avg_len,
+    }
+
+
+def _bm25(index: dict, item: dict, query: Counter) -> float:
+    length = sum(item["tokens"].values())
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (index["avg_len"] or 1))
+    score = 0.0
+    for token in query:
+        tf = item["tokens"].get(token, 0)
+        if tf:
+            score += index["idf"][token] * tf * (BM25_K1 + 1) / (tf + norm)
+    return score
+
+
+def select_resume_context(
+    index: dict, job_description: str, top_k: int = 20, token_budget: int = 1500
+) -> str:
+    """
+    Build a prompt context from the header and the bullets most relevant to a job description.
+
+    The header and standalone lines (skills, education) are always included. Bullets are
+    ranked by BM25 against the JD, limited to top_k and the remaining token_budget, and emitted
+    in document order under their section headings and role lines. Each bullet is prefixed
+    with its id, e.g. "[12] Built ...", so rewrites can be matched back exactly.
+
+    Args:
+        index (dict): Index from build_resume_index.
+        job_description (str): Raw job description text.
+        top_k (int): Maximum number of bullets to include.
+        token_budget (int): Approximate token budget for the whole context.
+
+    Returns:
+        str: The selected resume context.
+    """
+    query = Counter(tokenize(job_description))
+    items_by_id = {item["id"]: item for item in index["items"]}
+    bullets = [items_by_id[i] for i in index["bullet_ids"]]
+    ranked = sorted(bullets, key=lambda item: _bm25(index, item, query), reverse=True)
+
+    budget = token_budget - sum(estimate_tokens(t) for t in index["header"])
+    for item_id in index["standalone_ids"]:
+        budget -= estimate_tokens(items_by_id[item_id]["text"])
+    selected = set()
+    for item in ranked[:top_k]:
+        cost = estimate_tokens(item["text"])
+        if cost > budget:
+            continue
+        selected.add(item["id"])
+        budget -= cost
+
+    # Keep the headings and role lines that the selected bullets sit under
+    keep = selected | set(index["standalone_ids"])
+    for item_id in selected:
+        item = items_by_id[item_id]
+        if item["context"] is not None:
+            keep.add(item["context"])
+    kept_sections = {items_by_id[i]["section"] for i in keep}
+
+    lines = list(index["header"])
+    for item in index["items"]:
+        if item["kind"] == "heading" and item["section"] in kept_sections:
+            lines.append(f"\n{item['text']}")
+        elif item["id"] in keep:
+            prefix = f"[{item['id']}] " if item["kind"] == "bullet" else ""
+            lines.append(f"{prefix}{item['text']}")
+
+    return "\n".join(lines)
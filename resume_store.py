@@ -0,0 +1,457 @@
+import os
+import io
+import csv
+import json
+import time
+import shutil
+import hashlib
+import zipfile
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config import PATHS, get_artifact_path
+from pdf_tools import (
+    copy_docx,
+    clone_docx,
+    apply_changes_to_document,
+    document_to_pdf,
+    get_paragraph_texts,
+)
+
+# Loading config constants
+EXPORTS_DIR = PATHS["EXPORTS_DIR"]
+MASTER_VERSIONS_DIR = PATHS["MASTER_VERSIONS_DIR"]
+ARTIFACTS_DIR = PATHS["ARTIFACTS_DIR"]
+RENDER_CACHE_DIR = PATHS["RENDER_CACHE_DIR"]
+
+# Maximum number of rendered PDFs kept on disk
+RENDER_CACHE_SIZE = 50
+
+# Number of tailored resumes prepared concurrently during a re-tailor; the docx edits run
+# in parallel, while the docx2pdf conversions themselves are serialized in pdf_tools
+RENDER_WORKERS = 4
+
+
+def bytes_hash(data: bytes) -> str:
+    """
+    Compute a short content hash of in-memory bytes.
+
+    Args:
+        data (bytes): Content to hash.
+
+    Returns:
+        str: First 16 hex characters of the SHA-256 digest.
+    """
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def file_hash(path: str) -> str:
+    """
+    Compute a short content hash of a file.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        str: First 16 hex characters of the file's SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def store_master_version(master_docx_path: str) -> str:
+    """
+    Keep a content-addressed copy of a master resume so tailored resumes can be re-rendered later.
+
+    Args:
+        master_docx_path (str): Path to the master resume .docx.
+
+    Returns:
+        str: The master version hash.
+    """
+    master_hash = file_hash(master_docx_path)
+    version_path = get_master_version_path(master_hash)
+    if not os.path.exists(version_path):
+        copy_docx(master_docx_path, version_path)
+    return master_hash
+
+
+def get_master_version_path(master_hash: str) -> str:
+    return os.path.join(MASTER_VERSIONS_DIR, f"{master_hash}.docx")
+
+
+def save_artifact(
+    job_id: int, company: str, title: str, master_hash: str, changes: list[dict]
+):
+    """
+    Store a tailored resume as its change list against a master resume version.
+
+    Args:
+        job_id (int): The job ID from jobs.csv.
+        company (str): Company name.
+        title (str): Job title.
+        master_hash (str): Version hash of the master resume the changes apply to.
+        changes (list[dict]): List of {original, rewritten} dicts from the LLM.
+    """
+    artifact = {
+        "job_id": int(job_id),
+        "company": company,
+        "title": title,
+        "master_hash": master_hash,
+        "changes": changes,
+    }
+    with open(get_artifact_path(job_id), "w") as f:
+        json.dump(artifact, f)
+
+
+def bind_artifact(artifact: dict, job_id: int) -> dict:
+    """
+    Store a tailored resume that was built before its job was saved under the job's id.
+
+    Artifacts are only written once the job row exists, so a job inserted in the meantime
+    (e.g. by a bulk import) can never pick up another posting's tailored resume.
+
+    Args:
+        artifact (dict): Unbound artifact (job_id None) as returned by tailor_resume.
+        job_id (int): The saved job's ID from jobs.csv.
+
+    Returns:
+        dict: The stored artifact.
+    """
+    artifact = {**artifact, "job_id": int(job_id)}
+    save_artifact(**artifact)
+    return artifact
+
+
+def load_artifact(job_id: int) -> dict | None:
+    """
+    Load the stored change list for a job.
+
+    Args:
+        job_id (int): The job ID from jobs.csv.
+
+    Returns:
+        dict | None: The artifact, or None if no tailored resume was stored for the job.
+    """
+    path = get_artifact_path(job_id)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def has_artifact(job_id: int) -> bool:
+    return os.path.exists(get_artifact_path(job_id))
+
+
+def list_artifacts() -> list[dict]:
+    """
+    Load every stored tailored resume artifact.
+
+    Returns:
+        list[dict]: Artifacts as returned by load_artifact, ordered by job ID.
+    """
+    artifacts = []
+    for name in sorted(os.listdir(ARTIFACTS_DIR)):
+        if name.endswith(".json"):
+            with open(os.path.join(ARTIFACTS_DIR, name)) as f:
+                artifacts.append(json.load(f))
+    return artifacts
+
+
+def list_stale_artifacts(master_hash: str) -> list[dict]:
+    """
+    Find artifacts that were tailored against a different master resume version.
+
+    Args:
+        master_hash (str): Version hash of the current master resume.
+
+    Returns:
+        list[dict]: Artifacts whose master_hash differs from master_hash.
+    """
+    return [a for a in list_artifacts() if a["master_hash"] != master_hash]
+
+
+def _render_key(master_hash: str, changes: list[dict]) -> str:
+    # Identical master and changes give identical output, so they share one cached PDF
+    payload = json.dumps([master_hash, changes], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _evict_render_cache():
+    """Delete the least recently used rendered PDFs beyond RENDER_CACHE_SIZE."""
+    cached = [
+        os.path.join(RENDER_CACHE_DIR, name)
+        for name in os.listdir(RENDER_CACHE_DIR)
+        if name.endswith(".pdf")
+    ]
+    if len(cached) <= RENDER_CACHE_SIZE:
+        return
+
+    # Another render may evict concurrently, so tolerate files that disappear
+    mtimes = {}
+    for path in cached:
+        try:
+            mtimes[path] = os.path.getmtime(path)
+        except FileNotFoundError:
+            pass
+    for path in sorted(mtimes, key=mtimes.get, reverse=True)[RENDER_CACHE_SIZE:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def render_artifact(artifact: dict) -> str:
+    """
+    Return a rendered PDF for a stored artifact, rendering it only on a cache miss.
+
+    Args:
+        artifact (dict): Artifact as returned by load_artifact.
+
+    Returns:
+        str: Path to the rendered PDF in the render cache.
+
+    Raises:
+        FileNotFoundError: If the master resume version is no longer stored.
+        RuntimeError: If docx to pdf conversion fails.
+    """
+    master_hash = artifact["master_hash"]
+    key = _render_key(master_hash, artifact["changes"])
+    pdf_path = os.path.join(RENDER_CACHE_DIR, f"{key}.pdf")
+
+    if os.path.exists(pdf_path):
+        # Mark as recently used
+        os.utime(pdf_path)
+        return pdf_path
+
+    master_docx_path = get_master_version_path(master_hash)
+    if not os.path.exists(master_docx_path):
+        raise FileNotFoundError(f"Master resume version not found: {master_hash}")
+
+    # Edit an in-memory clone of the parsed master instead of a copied .docx file
+    doc = clone_docx(master_docx_path)
+    apply_changes_to_document(doc, artifact["changes"])
+    document_to_pdf(doc, pdf_path)
+
+    _evict_render_cache()
+    return pdf_path
+
+
+# Renders requested from the UI run here so the page stays responsive
+_render_executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS)
+
+
+def render_artifact_async(artifact: dict) -> Future:
+    """
+    Start rendering a tailored resume in the background.
+
+    Args:
+        artifact (dict): Artifact, bound to a job or not yet.
+
+    Returns:
+        Future: Resolves to the rendered PDF path.
+    """
+    return _render_executor.submit(render_artifact, artifact)
+
+
+def get_artifact_filename(artifact: dict) -> str:
+    """
+    Build the download file name for a tailored resume, e.g. 001_google_software_engineer.pdf.
+
+    Artifacts not yet bound to a saved job have no id prefix.
+
+    Args:
+        artifact (dict): Artifact as returned by load_artifact or tailor_resume.
+
+    Returns:
+        str: PDF file name.
+    """
+    name = f"{artifact['company']}_{artifact['title']}.pdf"
+    if artifact["job_id"] is None:
+        return name
+    return f"{artifact['job_id']:03d}_{name}"
+
+
+def retailor_artifacts(master_hash: str) -> list[dict]:
+    """
+    Move stale tailored resumes onto a new master resume version without re-running the LLM.
+
+    Each stored change is kept only if its original bullet still exists verbatim in the new
+    master. The most recent RENDER_CACHE_SIZE affected resumes are then re-rendered in
+    parallel to warm the render cache; older ones would only be evicted again, so they are
+    rendered on demand.
+
+    Args:
+        master_hash (str): Version hash of the new master resume (must be stored already).
+
+    Returns:
+        list[dict]: One summary per re-tailored job with job_id, company, title, kept and
+        dropped change counts, and error (None if rendering succeeded or was deferred).
+
+    Raises:
+        FileNotFoundError: If the master resume version is not stored.
+    """
+    master_docx_path = get_master_version_path(master_hash)
+    if not os.path.exists(master_docx_path):
+        raise FileNotFoundError(f"Master resume version not found: {master_hash}")
+
+    # Parse the new master once and match every stored change against it
+    paragraphs = get_paragraph_texts(master_docx_path)
+
+    summaries = []
+    retailored = []
+    for artifact in list_stale_artifacts(master_hash):
+        kept = [
+            c for c in artifact["changes"] if c.get("original", "").strip() in paragraphs
+        ]
+        summaries.append(
+            {
+                "job_id": artifact["job_id"],
+                "company": artifact["company"],
+                "title": artifact["title"],
+                "kept": len(kept),
+                "dropped": len(artifact["changes"]) - len(kept),
+                "error": None,
+            }
+        )
+        artifact = {**artifact, "master_hash": master_hash, "changes": kept}
+        save_artifact(**artifact)
+        retailored.append(artifact)
+
+    def _render(artifact: dict) -> str | None:
+        try:
+            render_artifact(artifact)
+        except (FileNotFoundError, RuntimeError) as e:
+            return str(e)
+        return None
+
+    # Jobs that end up with identical changes share one render; newest jobs first, since
+    # anything past the cache size would be evicted by the renders after it
+    newest_first = sorted(
+        retailored,
+        key=lambda a: -1 if a["job_id"] is None else int(a["job_id"]),
+        reverse=True,
+    )
+    unique = {}
+    for artifact in newest_first:
+        key = _render_key(artifact["master_hash"], artifact["changes"])
+        if key not in unique and len(unique) < RENDER_CACHE_SIZE:
+            unique[key] = artifact
+    with ThreadPoolExecutor(max_workers=RENDER_WORKERS) as executor:
+        errors = dict(zip(unique, executor.map(_render, unique.values())))
+
+    for summary, artifact in zip(summaries, retailored):
+        summary["error"] = errors.get(_render_key(master_hash, artifact["changes"]))
+
+    return summaries
+
+
+def get_job_resume(job: dict) -> tuple[str, str] | None:
+    """
+    Locate a job's tailored resume PDF, rendering it from its artifact on a cache miss.
+
+    Falls back to a legacy full PDF stored in the job's resume_path.
+
+    Args:
+        job (dict): Job row with at least id and resume_path.
+
+    Returns:
+        tuple[str, str] | None: (pdf_path, download file name), or None if the job has none.
+    """
+    artifact = load_artifact(job["id"])
+    if artifact is not None:
+        return render_artifact(artifact), get_artifact_filename(artifact)
+
+    resume_path = str(job.get("resume_path", ""))
+    if resume_path and os.path.exists(resume_path):
+        return resume_path, os.path.basename(resume_path)
+
+    return None
+
+
+# Columns written to the export manifests
+MANIFEST_COLUMNS = [
+    "id",
+    "company",
+    "title",
+    "status",
+    "date_added",
+    "url",
+    "resume_file",
+    "description",
+]
+
+
+def export_applications(jobs, zip_path: str | None = None) -> str:
+    """
+    Write applications and their tailored resumes to a zip archive, streaming entry by entry
+    so memory use does not grow with the number of jobs.
+
+    Each PDF is rendered (or fetched from the render cache) and copied into the archive in
+    chunks before the next one is touched. Manifest rows are spooled to temporary files as
+    they are produced and added as manifest.csv and manifest.json at the end, since a zip
+    archive can only have one entry open for writing at a time.
+
+    Args:
+        jobs: Iterable of job rows (dicts) to export.
+        zip_path (str | None): Destination path; defaults to a timestamped file in EXPORTS_DIR.
+
+    Returns:
+        str: Path to the written zip file.
+    """
+    if zip_path is None:
+        zip_path = os.path.join(
+            EXPORTS_DIR, f"applications_{time.strftime('%Y%m%d_%H%M%S')}.zip"
+        )
+
+    csv_file = tempfile.TemporaryFile("w+", newline="")
+    json_file = tempfile.TemporaryFile("w+")
+    with csv_file, json_file, zipfile.ZipFile(
+        zip_path, "w", compression=zipfile.ZIP_DEFLATED
+    ) as archive:
+        writer = csv.DictWriter(csv_file, fieldnames=MANIFEST_COLUMNS)
+        writer.writeheader()
+        json_file.write("[")
+
+        used_names = set()
+        for count, job in enumerate(jobs):
+            try:
+                resume = get_job_resume(job)
+            except (FileNotFoundError, RuntimeError):
+                resume = None
+
+            resume_file = ""
+            if resume is not None:
+                pdf_path, file_name = resume
+                # Legacy resumes can share a base name; number the later ones so every
+                # manifest row points at its own file
+                stem, ext = os.path.splitext(file_name)
+                resume_file = f"resumes/{file_name}"
+                suffix = 2
+                while resume_file in used_names:
+                    resume_file = f"resumes/{stem}_{suffix}{ext}"
+                    suffix += 1
+                used_names.add(resume_file)
+                with open(pdf_path, "rb") as src, archive.open(resume_file, "w") as dst:
+                    shutil.copyfileobj(src, dst)
+
+            row = {column: str(job.get(column, "")) for column in MANIFEST_COLUMNS}
+            row["resume_file"] = resume_file
+            writer.writerow(row)
+            json_file.write(("," if count else "") + "\n" + json.dumps(row))
+
+        json_file.write("\n]\n")
+
+        # Copy the spooled manifests into the archive in chunks
+        for name, spool in (("manifest.csv", csv_file), ("manifest.json", json_file)):
+            spool.seek(0)
+            with archive.open(name, "w") as dst, io.TextIOWrapper(
+                dst, encoding="utf-8", newline=""
+            ) as text_dst:
+                shutil.copyfileobj(spool, text_dst)
+
+    return zip_path
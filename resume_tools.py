@@ -1,16 +1,30 @@
 import os
-import json
+import re
+import difflib
+from functools import lru_cache
 from dotenv import load_dotenv
 
 from langchain_community.document_loaders import PyMuPDFLoader
 from langchain_core.documents import Document
 from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 
-from prompts import resume_score_prompt, resume_tailor_prompt
+from prompts import (
+    resume_score_prompt,
+    resume_tailor_prompt,
+    resume_score_reask_prompt,
+)
+from json_tools import (
+    SCORE_SCHEMA,
+    CHANGE_SCHEMA,
+    parse_llm_json,
+    validate_object,
+    validate_list,
+)
 from config import PATHS
-from pdf_tools import docx_to_pdf, copy_docx, apply_changes_to_docx
+from model_router import ModelRouter
+from resume_index import build_resume_index, select_resume_context
+from pdf_tools import get_paragraphs, get_paragraph_outline
+from resume_store import store_master_version
 
 # Loading Environment Variables
 load_dotenv()
@@ -20,21 +34,120 @@ os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
 MASTER_RESUME_DOCX_PATH = PATHS["MASTER_RESUME_DOCX_PATH"]
 MASTER_RESUME_PDF_PATH = PATHS["MASTER_RESUME_PDF_PATH"]
 RESUME_DIR = PATHS["RESUME_DIR"]
-TAILORED_DIR = PATHS["TAILORED_DIR"]
-
-# Loading Model
-MODEL = "llama-3.1-8b-instant"
-LLM = ChatGroq(
-    model="llama-3.1-8b-instant",
-    api_key=os.environ["GROQ_API_KEY"],
-    temperature=0,
-    model_kwargs={"response_format": {"type": "json_object"}},
+
+# Resume context selection: number of bullets and approximate token budget per prompt
+CONTEXT_TOP_K = 20
+CONTEXT_TOKENS = 1500
+_ID_PREFIX_RE = re.compile(r"^\[\d+\]\s*")
+
+# A rewrite's quoted original must be at least this similar to the paragraph its id points
+# to for the id to be trusted; below it the id and text disagree and the rewrite is dropped
+ID_MATCH_RATIO = 0.6
+
+# Loading Models: a fast tier for scoring and a strong tier for rewrites worth the spend.
+# Each tier is a comma-separated list; the router picks the most reliable, cheapest and
+# fastest model in it and falls through to the others on failure
+FAST_MODELS = os.getenv(
+    "FAST_MODELS", os.getenv("FAST_MODEL", "llama-3.1-8b-instant")
+)
+STRONG_MODELS = os.getenv(
+    "STRONG_MODELS", os.getenv("STRONG_MODEL", "llama-3.3-70b-versatile")
+)
+
+# Rewrites escalate to the strong tier for jobs scoring at least this much
+ESCALATE_SCORE = int(os.getenv("ESCALATE_SCORE", "60"))
+
+# Approximate USD per million tokens, for the router's cost stats and ranking
+MODEL_COSTS = {
+    "llama-3.1-8b-instant": 0.06,
+    "gemma2-9b-it": 0.20,
+    "llama-3.3-70b-versatile": 0.70,
+}
+
+
+def _groq_model(model: str) -> ChatGroq:
+    return ChatGroq(
+        model=model,
+        api_key=os.environ["GROQ_API_KEY"],
+        temperature=0,
+        model_kwargs={"response_format": {"type": "json_object"}},
+    )
+
+
+def _groq_tier(models: str) -> list[ChatGroq]:
+    return [_groq_model(m.strip()) for m in models.split(",") if m.strip()]
+
+
+ROUTER = ModelRouter(
+    {"fast": _groq_tier(FAST_MODELS), "strong": _groq_tier(STRONG_MODELS)},
+    costs=MODEL_COSTS,
 )
 
 
+def extract_resume_text(pdf_path: str, txt_path: str) -> str:
+    """
+    Extract the text of a resume PDF and cache it next to the PDF.
+
+    Args:
+        pdf_path (str): File path to the resume PDF.
+        txt_path (str): File path for the cached text.
+
+    Returns:
+        str: The extracted text, pages joined by blank lines.
+    """
+    pdf_loader = PyMuPDFLoader(pdf_path)
+    pdf_docs = pdf_loader.load()
+    pdf_context = "\n\n".join(d.page_content for d in pdf_docs)
+
+    with open(txt_path, "w", encoding="utf-8") as f:
+        f.write(pdf_context)
+
+    return pdf_context
+
+
+def load_resume_text(pdf_path: str, txt_path: str) -> str:
+    """
+    Load the cached text of a resume PDF, re-extracting it if the PDF is newer than the cache.
+
+    Args:
+        pdf_path (str): File path to the resume PDF.
+        txt_path (str): File path for the cached text.
+
+    Returns:
+        str: The resume text.
+    """
+    if os.path.exists(txt_path) and os.path.getmtime(txt_path) >= os.path.getmtime(
+        pdf_path
+    ):
+        with open(txt_path, encoding="utf-8") as f:
+            return f.read()
+
+    return extract_resume_text(pdf_path, txt_path)
+
+
+@lru_cache(maxsize=4)
+def _master_index(docx_path: str, mtime_ns: int) -> dict:
+    return build_resume_index(get_paragraph_outline(docx_path))
+
+
+def get_master_index() -> dict:
+    """
+    Return the section/bullet index of the master resume, built once per master version.
+
+    Returns:
+        dict: Index as returned by build_resume_index.
+    """
+    mtime_ns = os.stat(MASTER_RESUME_DOCX_PATH).st_mtime_ns
+    return _master_index(MASTER_RESUME_DOCX_PATH, mtime_ns)
+
+
 def prepare_data(master_resume_pdf_path: str, job_description: str) -> tuple[str, str]:
     """
-    Load and extract text content from a resume PDF and a job description string.
+    Load the resume context relevant to a job description, and the job description string.
+
+    Only the header, standalone lines and the top-ranked bullets for this JD are sent to the
+    LLM, each bullet tagged with its id. If the master .docx yields no bullets (e.g. a
+    table-based layout), the full extracted PDF text is used instead.
 
     Args:
         master_resume_pdf_path (str): File path to the master resume PDF.
@@ -43,10 +156,17 @@ def prepare_data(master_resume_pdf_path: str, job_description: str) -> tuple[str
     Returns:
         tuple[str, str]: A tuple of (pdf_context, jd_context) where both are plain strings ready to be injected into a prompt template.
     """
-    # Load pdf
-    pdf_loader = PyMuPDFLoader(master_resume_pdf_path)
-    pdf_docs = pdf_loader.load()
-    pdf_context = "\n\n".join(d.page_content for d in pdf_docs)
+    # Select relevant resume sections within the token budget
+    index = get_master_index() if os.path.exists(MASTER_RESUME_DOCX_PATH) else None
+    if index and index["bullet_ids"]:
+        pdf_context = select_resume_context(
+            index, job_description, top_k=CONTEXT_TOP_K, token_budget=CONTEXT_TOKENS
+        )
+    else:
+        # Load pdf text, extracted once per master resume version
+        pdf_context = load_resume_text(
+            master_resume_pdf_path, master_resume_pdf_path.replace(".pdf", ".txt")
+        )
 
     # Load Job Description text
     jd_text_context = Document(
@@ -56,13 +176,63 @@ def prepare_data(master_resume_pdf_path: str, job_description: str) -> tuple[str
     return pdf_context, jd_text_context
 
 
-def get_resume_score(pdf_context: str, jd_text_context: str) -> str:
+def resolve_change_ids(changes_list: list[dict]) -> list[dict]:
+    """
+    Match each rewrite to the exact master paragraph it rewrites.
+
+    The quoted original text wins when it matches a paragraph exactly, so an off-by-one id
+    cannot redirect a rewrite to the wrong bullet. Otherwise the bullet id is used, but only
+    if the quoted text is close to that bullet (or empty); when they disagree the rewrite
+    is dropped.
+
+    Args:
+        changes_list (list[dict]): Validated rewrites, optionally carrying an "id".
+
+    Returns:
+        list[dict]: Rewrites whose original text is the exact master paragraph where it could
+        be resolved; rewrites with neither a matching text nor a usable id are returned with
+        their text unchanged.
+    """
+    paragraphs = get_paragraphs(MASTER_RESUME_DOCX_PATH)
+    bullet_ids = set(get_master_index()["bullet_ids"])
+    ids_by_text = {}
+    for idx, text in enumerate(paragraphs):
+        ids_by_text.setdefault(text, idx)
+
+    resolved = []
+    for change in changes_list:
+        # Drop an id prefix copied into the text, e.g. "[12] Built ..."
+        original = _ID_PREFIX_RE.sub("", change["original"]).strip()
+        try:
+            bullet_id = int(str(change.get("id", "")).strip("[] "))
+        except ValueError:
+            bullet_id = None
+
+        if original in ids_by_text:
+            change = {**change, "id": ids_by_text[original], "original": original}
+        elif bullet_id in bullet_ids:
+            similarity = difflib.SequenceMatcher(
+                None, original, paragraphs[bullet_id]
+            ).ratio()
+            if original and similarity < ID_MATCH_RATIO:
+                continue
+            change = {**change, "id": bullet_id, "original": paragraphs[bullet_id]}
+        else:
+            change = {**change, "original": original}
+        resolved.append(change)
+    return resolved
+
+
+def get_resume_score(
+    pdf_context: str, jd_text_context: str, tier: str = "fast"
+) -> str:
     """
     Score a resume against a job description using an LLM and return the result as a JSON string.
 
     Args:
         pdf_context (str): Extracted text content from the resume PDF.
         jd_text_context (str): Raw job description text.
+        tier (str): Model tier to route the call to (default "fast").
 
     Returns:
         str: A JSON-formatted string containing:
@@ -70,144 +240,223 @@ def get_resume_score(pdf_context: str, jd_text_context: str) -> str:
             - scoreRationale (str): 1-2 sentence explanation of the score.
             - keywordGaps (list[str]): Keywords present in the JD but missing from the resume.
     """
-    prompt = ChatPromptTemplate.from_template(resume_score_prompt)
-
-    chain = prompt | LLM | StrOutputParser()
-    result = chain.invoke(
-        {"resume_context": pdf_context, "jd_context": jd_text_context}
+    result = ROUTER.invoke(
+        tier,
+        resume_score_prompt,
+        {"resume_context": pdf_context, "jd_context": jd_text_context},
     )
 
     return result
 
 
-def get_resume_change_suggestions(pdf_context: str, jd_text_context: str) -> str:
+def get_resume_change_suggestions(
+    pdf_context: str, jd_text_context: str, tier: str = "fast"
+) -> str:
     """
     Suggest resume bullet point rewrites tailored to a job description using an LLM.
 
     Args:
         pdf_context (str): Extracted text content from the resume PDF.
         jd_text_context (str): Raw job description text.
+        tier (str): Model tier to route the call to (default "fast").
 
     Returns:
-        str: A JSON-formatted string containing a list of bullet rewrite objects, each with:
+        str: A JSON-formatted string containing a "changes" list of bullet rewrite objects, each with:
             - original (str): The original bullet point from the resume.
             - rewritten (str): The improved version tailored to the job description.
     """
-    prompt = ChatPromptTemplate.from_template(resume_tailor_prompt)
+    result = ROUTER.invoke(
+        tier,
+        resume_tailor_prompt,
+        {"resume_context": pdf_context, "jd_context": jd_text_context},
+    )
+    return result
+
+
+def get_missing_score_fields(
+    pdf_context: str,
+    jd_text_context: str,
+    missing_fields: list[str],
+    tier: str = "strong",
+) -> str:
+    """
+    Re-ask the LLM for only the score fields missing from a previous response.
 
-    chain = prompt | LLM | StrOutputParser()
-    result = chain.invoke(
-        {"resume_context": pdf_context, "jd_context": jd_text_context}
+    Args:
+        pdf_context (str): Extracted text content from the resume PDF.
+        jd_text_context (str): Raw job description text.
+        missing_fields (list[str]): Names of the fields to ask for.
+        tier (str): Model tier to route the call to (default "strong").
+
+    Returns:
+        str: A JSON-formatted string containing only the requested fields.
+    """
+    result = ROUTER.invoke(
+        tier,
+        resume_score_reask_prompt,
+        {
+            "resume_context": pdf_context,
+            "jd_context": jd_text_context,
+            "missing_fields": ", ".join(missing_fields),
+        },
     )
     return result
 
 
-def get_tailored_resume_path(job_id: int, company: str, title: str) -> str:
+def _parse_or_empty(result: str):
+    try:
+        return parse_llm_json(result)
+    except ValueError:
+        return {}
+
+
+def parse_resume_score(result: str, pdf_context: str, jd_text_context: str) -> dict:
     """
-    Generate a standardised file path for a tailored resume with the format {jobid}_{company}_{title}.docx.
+    Parse and validate a score response, re-asking only for fields that are missing or invalid.
 
     Args:
-        job_id (int): The job ID from jobs.csv.
-        company (str): Company name.
-        title (str): Job title.
+        result (str): Raw LLM score response.
+        pdf_context (str): Extracted text content from the resume PDF.
+        jd_text_context (str): Raw job description text.
 
     Returns:
-        str: file path e.g. /path/to/tailored/001_google_software_engineer.docx
+        dict: Score response with score, scoreRationale, keywordGaps and visaSponsorship.
+
+    Raises:
+        ValueError: If no match score could be recovered, even after a re-ask.
     """
+    score_json, missing = validate_object(_parse_or_empty(result), SCORE_SCHEMA)
 
-    filename = f"{job_id:03d}_{company}_{title}.docx"
-    filepath = os.path.join(TAILORED_DIR, filename)
+    if missing:
+        reask_result = get_missing_score_fields(pdf_context, jd_text_context, missing)
+        recovered, _ = validate_object(
+            _parse_or_empty(reask_result), {f: SCORE_SCHEMA[f] for f in missing}
+        )
+        score_json.update(recovered)
 
-    return filepath
+    if "score" not in score_json:
+        raise ValueError("LLM response did not include a match score.")
 
+    # Neutral defaults for optional fields the LLM still did not provide
+    score_json.setdefault("scoreRationale", "")
+    score_json.setdefault("keywordGaps", [])
+    score_json.setdefault("visaSponsorship", True)
 
-def edit_resume(
-    changes: list[dict],
-    job_id: int,
-    company: str,
-    title: str,
-) -> str:
+    return score_json
+
+
+def parse_resume_changes(
+    result: str, pdf_context: str, jd_text_context: str
+) -> list[dict]:
     """
-    Apply LLM-suggested bullet rewrites while preserving formatting, and export back to PDF.
+    Parse and validate a rewrite response, re-asking once (on the strong tier) only if no
+    valid rewrite was recovered.
+
+    Args:
+        result (str): Raw LLM rewrite response.
+        pdf_context (str): Extracted text content from the resume PDF.
+        jd_text_context (str): Raw job description text.
+
+    Returns:
+        list[dict]: Valid {original, rewritten} dicts; malformed items are dropped.
+    """
+    changes_list = validate_list(_parse_or_empty(result), CHANGE_SCHEMA)
+
+    if not changes_list:
+        # Escalate: a failed validation is retried on the strong tier
+        reask_result = get_resume_change_suggestions(
+            pdf_context, jd_text_context, tier="strong"
+        )
+        changes_list = validate_list(_parse_or_empty(reask_result), CHANGE_SCHEMA)
+
+    return changes_list
+
+
+def build_tailored_resume(changes: list[dict], company: str, title: str) -> dict:
+    """
+    Record LLM-suggested bullet rewrites as a tailored resume artifact, without rendering it.
+
+    Only the change list and the master resume version hash are kept; the PDF is rendered
+    on demand through the render cache. The artifact is not bound to a job yet: it is stored
+    with bind_artifact once its job has been saved.
 
     Args:
         changes (list[dict]): List of {original, rewritten} dicts from the LLM.
-        job_id (int): The job ID from jobs.csv.
         company (str): Company name.
         title (str): Job title.
 
-
     Returns:
-        output_pdf_path (str): Destination path for the tailored .pdf file.
+        dict: Artifact with job_id None, company, title, master_hash and changes.
 
     Raises:
-        RuntimeError: If docx to pdf conversion or PDF export fails.
+        FileNotFoundError: If the master resume docx does not exist.
     """
     if not os.path.exists(MASTER_RESUME_DOCX_PATH):
         raise FileNotFoundError(
             f"Master resume docx not found: {MASTER_RESUME_DOCX_PATH}"
         )
 
-    # Step 1: Get tailored resume .docx path
-    tailored_resume_docx_path = get_tailored_resume_path(job_id, company, title)
-
-    # Step 2: Copy master resume docx to tailored resume path as the tailored resume file name
-    copy_docx(MASTER_RESUME_DOCX_PATH, tailored_resume_docx_path)
-
-    # Step 3: Apply LLM changes to the converted .docx
-    apply_changes_to_docx(tailored_resume_docx_path, changes)
+    # Keep a content-addressed copy of the master resume version the changes apply to
+    master_hash = store_master_version(MASTER_RESUME_DOCX_PATH)
 
-    # Step 4: Convert .docx to .pdf
-    tailored_resume_pdf_path = tailored_resume_docx_path.replace(".docx", ".pdf")
-    docx_to_pdf(tailored_resume_docx_path, tailored_resume_pdf_path)
-
-    # Step 5: Always clean up the temp files
-    if os.path.exists(tailored_resume_docx_path):
-        os.remove(tailored_resume_docx_path)
-
-    return tailored_resume_pdf_path
+    return {
+        "job_id": None,
+        "company": company,
+        "title": title,
+        "master_hash": master_hash,
+        "changes": changes,
+    }
 
 
 def tailor_resume(
     job_description: str,
-    job_id: int,
     company: str,
     title: str,
-) -> tuple[dict, list]:
+) -> tuple[dict, dict]:
     """
     Orchestrates the full resume tailoring pipeline for a given job description.
 
-    Extracts resume and JD text, scores the resume against the JD, and generates
-    bullet point rewrite suggestions — returning both as parsed Python objects.
+    Extracts resume and JD text, scores the resume against the JD on the fast model tier,
+    and generates bullet point rewrite suggestions — on the strong tier if the score is at
+    least ESCALATE_SCORE — returning both as parsed Python objects.
+    The rewrites are returned as an unbound tailored resume artifact, to be stored with
+    bind_artifact once the job is saved; the PDF is not rendered here, so results are
+    available as soon as the LLM responds.
 
     Args:
         job_description (str): Raw job description text.
-        job_id (int): The job ID from jobs.csv.
         company (str): Company name.
         title (str): Job title.
 
     Returns:
-        tuple[dict, list]: A tuple of (score_json, changes_list) where:
+        tuple[dict, dict]: A tuple of (score_json, artifact) where:
             - score_json (dict): Parsed score response containing:
                 - score (int): Match score from 0 to 100.
                 - scoreRationale (str): 1-2 sentence explanation of the score.
                 - keywordGaps (list[str]): Keywords missing from the resume.
-            - changes_list (list[dict]): Parsed list of bullet rewrite suggestions, each containing:
+            - artifact (dict): Tailored resume from build_tailored_resume, whose changes are
+              the parsed bullet rewrite suggestions, each containing:
                 - original (str): The original bullet point from the resume.
                 - rewritten (str): The improved, JD-aligned version.
     """
-    # Prepare data and invoke LLM calls
+    # Prepare data and score on the fast tier
     pdf_context, jd_text_context = prepare_data(MASTER_RESUME_PDF_PATH, job_description)
     original_resume_score = get_resume_score(pdf_context, jd_text_context)
+
+    # Convert to JSON, repairing malformed output and re-asking only for what is missing
+    score_json = parse_resume_score(original_resume_score, pdf_context, jd_text_context)
+
+    # Only jobs that clear the score threshold get rewrites from the strong tier
+    rewrite_tier = "strong" if score_json["score"] >= ESCALATE_SCORE else "fast"
     resume_change_suggestions = get_resume_change_suggestions(
-        pdf_context, jd_text_context
+        pdf_context, jd_text_context, tier=rewrite_tier
     )
+    changes_list = parse_resume_changes(
+        resume_change_suggestions, pdf_context, jd_text_context
+    )
+    changes_list = resolve_change_ids(changes_list)
 
-    # Convert to JSON
-    score_json = json.loads(original_resume_score)
-    changes_list = json.loads(resume_change_suggestions)
-
-    # Make edits to master resume
-    tailored_resume_path = edit_resume(changes_list, job_id, company, title)
+    # Record edits to the master resume, stored once the job is saved
+    artifact = build_tailored_resume(changes_list, company, title)
 
-    return score_json, changes_list, tailored_resume_path
+    return score_json, artifact
@@ -1,3 +1,7 @@
+import html
+import difflib
+
+
 def score_card_style(origial_score, score_rationale):
     return f"""
                 <div style="
@@ -58,3 +62,56 @@ def suggestions_style(original, rewritten):
                             <strong>After:</strong> {rewritten}
                         </div>
                         """
+
+
+def word_diff_style(original, rewritten):
+    """Return (before_html, after_html) with removed words struck in red and added words in green."""
+    before_words, after_words = original.split(), rewritten.split()
+    before, after = [], []
+    matcher = difflib.SequenceMatcher(a=before_words, b=after_words, autojunk=False)
+    for op, a1, a2, b1, b2 in matcher.get_opcodes():
+        removed = html.escape(" ".join(before_words[a1:a2]))
+        added = html.escape(" ".join(after_words[b1:b2]))
+        if op == "equal":
+            before.append(removed)
+            after.append(added)
+            continue
+        if removed:
+            before.append(
+                f'<span style="background:#FDDCDC; text-decoration:line-through;">{removed}</span>'
+            )
+        if added:
+            after.append(
+                f'<span style="background:#D4F5E0; font-weight:600;">{added}</span>'
+            )
+    return " ".join(before), " ".join(after)
+
+
+def resume_preview_style(paragraphs, changes, edited):
+    """Render resume paragraphs as HTML, highlighting the rewritten ones word by word."""
+    rewrites = {}
+    for change in changes:
+        original = change.get("original", "").strip()
+        rewritten = change.get("rewritten", "").strip()
+        if original and rewritten:
+            rewrites.setdefault(original, rewritten)
+
+    blocks = []
+    for paragraph in paragraphs:
+        if paragraph in rewrites:
+            before, after = word_diff_style(paragraph, rewrites.pop(paragraph))
+            text = after if edited else before
+        else:
+            text = html.escape(paragraph)
+        blocks.append(f'<p style="margin:0 0 6px 0;">{text}</p>')
+
+    return f"""<div style="
+                    background:#ffffff;
+                    border: 1px solid #ccc;
+                    border-radius:6px;
+                    padding:20px 24px;
+                    max-height:800px;
+                    overflow-y:auto;
+                    font-size:0.85rem;
+                    color:#333;
+                ">{"".join(blocks)}</div>"""
@@ -1,8 +1,31 @@
 import os
+import html
+import math
+import pandas as pd
 import streamlit as st
 from datetime import date
 
-from config import load_jobs, save_jobs, JOB_STATUSES
+from config import (
+    load_jobs,
+    update_jobs,
+    select_jobs,
+    paginate,
+    get_row_changes,
+    load_job_stats,
+    get_job_funnel,
+    search_jobs,
+    JOB_STATUSES,
+)
+from resume_store import has_artifact, get_job_resume, export_applications
+
+PAGE_SIZES = [25, 50, 100, 250]
+SORT_COLUMNS = {
+    "Date Added": "date_added",
+    "Company": "company",
+    "Job Title": "title",
+    "Status": "status",
+    "ID": "id",
+}
 
 
 def render():
@@ -15,34 +38,88 @@ def render():
         )
     else:
         # ── Summary metrics ───────────────────────────────────────────────────
-        metrics = ["Applied today", "Referral Pending", "Applied"]
+        # Read from the maintained aggregates, so cost does not grow with the table
+        stats = load_job_stats()
+        funnel = get_job_funnel(stats)
+
+        metrics = {
+            "Applied today": stats["by_day"].get(str(date.today()), 0),
+            "Referral Pending": stats["by_status"].get("Referral Pending", 0),
+            "Applied": stats["by_status"].get("Applied", 0),
+            "Interview rate": f"{funnel['interview_rate']:.0%}",
+            "Offer rate": f"{funnel['offer_rate']:.0%}",
+        }
         m_cols = st.columns(len(metrics))
-        for i, status in enumerate(metrics):
-            if status == "Applied today":
-                count = len(jobs_df[jobs_df["date_added"] == date.today()])
-            else:
-                count = len(jobs_df[jobs_df["status"] == status])
-            m_cols[i].metric(status, count)
+        for i, (label, value) in enumerate(metrics.items()):
+            m_cols[i].metric(label, value)
+
+        # ── Weekly trend ──────────────────────────────────────────────────────
+        with st.expander("📈 Weekly Trend"):
+            weekly = pd.Series(stats["by_week"], name="Applications").sort_index()
+            weekly.index.name = "Week of"
+            st.bar_chart(weekly)
 
         st.divider()
 
         # ── Editable table ────────────────────────────────────────────────────
         st.subheader("Applications")
 
-        status_filter = st.multiselect("Filter by Status", options=JOB_STATUSES)
-        if status_filter:
-            filtered_jobs_df = jobs_df[jobs_df["status"].isin(status_filter)]
-        else:
-            filtered_jobs_df = jobs_df
+        f_col1, f_col2, f_col3 = st.columns(3)
+        with f_col1:
+            status_filter = st.multiselect("Filter by Status", options=JOB_STATUSES)
+        with f_col2:
+            company_filter = st.multiselect(
+                "Filter by Company", options=sorted(stats["by_company"])
+            )
+        with f_col3:
+            date_filter = st.date_input("Filter by Date Added", value=())
+
+        s_col1, s_col2, s_col3, s_col4 = st.columns(4)
+        with s_col1:
+            sort_by = st.selectbox("Sort by", options=list(SORT_COLUMNS.keys()))
+        with s_col2:
+            ascending = st.toggle("Ascending", value=False)
+        with s_col3:
+            page_size = st.selectbox("Rows per page", options=PAGE_SIZES)
+
+        # Filter once; the match count and the page sent to the editor both come from it
+        filters = {
+            "statuses": status_filter,
+            "companies": company_filter,
+            "date_range": date_filter if len(date_filter) == 2 else None,
+        }
+        matched_df = select_jobs(**filters)
+        matched_count = len(matched_df)
+        page_count = max(math.ceil(matched_count / page_size), 1)
+        with s_col4:
+            page = st.number_input("Page", min_value=1, max_value=page_count, step=1)
+        page_df = paginate(
+            matched_df,
+            sort_by=SORT_COLUMNS[sort_by],
+            ascending=ascending,
+            page=page,
+            page_size=page_size,
+        )
+
+        first_row = (page - 1) * page_size + 1 if matched_count else 0
+        last_row = (page - 1) * page_size + len(page_df)
+        st.caption(
+            f"Showing {first_row}–{last_row} of {matched_count} matching "
+            f"({len(jobs_df)} application(s) in total)"
+        )
 
-        st.caption(f"Showing {len(filtered_jobs_df)} of {len(jobs_df)} application(s)")
+        display_df = page_df.set_index("id")[
+            ["company", "title", "status", "date_added", "resume_path", "url"]
+        ]
+        # Edits are tied to the exact page shown, so a new view starts clean
+        view = (str(filters), sort_by, ascending, page_size, page)
+        editor_key = f"jobs_table_{st.session_state.jobs_table_key}_{hash(view)}"
 
-        edited_df = st.data_editor(
-            filtered_jobs_df[
-                ["company", "title", "status", "date_added", "resume_path", "url"]
-            ],
+        st.data_editor(
+            display_df,
             width="stretch",
             column_config={
+                "_index": st.column_config.NumberColumn("ID", disabled=True),
                 "company": st.column_config.TextColumn("Company"),
                 "title": st.column_config.TextColumn("Job Title"),
                 "status": st.column_config.SelectboxColumn(
@@ -53,41 +130,149 @@ def render():
                 "url": st.column_config.TextColumn("Job URL"),
             },
             num_rows="dynamic",
-            key="jobs_table",
+            key=editor_key,
         )
 
         if st.button("💾 Save Changes", width="content"):
-            # Merge editable columns back into full df (preserves description column)
-            jobs_df.update(edited_df[["id", "status"]].set_index(edited_df.index))
-            save_jobs(jobs_df)
-            st.success("Changes saved!")
+            # Push only the edited, added and deleted rows, keyed by job id
+            changes = get_row_changes(
+                st.session_state[editor_key], list(display_df.index)
+            )
+            update_jobs(changes)
+            st.session_state["jobs_save_success"] = "Changes saved!"
+            st.session_state.jobs_table_key += 1
+            st.rerun()
+        if "jobs_save_success" in st.session_state:
+            st.success(st.session_state.pop("jobs_save_success"))
+
+        st.divider()
+
+        # ── Full-text search ──────────────────────────────────────────────────
+        st.subheader("Search Job Descriptions")
+        search_query = st.text_input(
+            "🔍 Search company, title and description",
+            placeholder='e.g. kubernetes AND visa, "machine learning", data NOT analyst',
+        )
+        if search_query:
+            results_df = search_jobs(search_query)
+            st.caption(f"{len(results_df)} matching application(s)")
+            for result in results_df.itertuples():
+                # Escape the JD text first, then turn the match markers into highlights
+                snippet = (
+                    html.escape(result.snippet)
+                    .replace("\x02", "<mark>")
+                    .replace("\x03", "</mark>")
+                )
+                st.markdown(
+                    f"**#{result.id} — {html.escape(result.title)} @ "
+                    f"{html.escape(result.company)}**<br>{snippet}",
+                    unsafe_allow_html=True,
+                )
 
         st.divider()
 
         # ── Job description expander ──────────────────────────────────────────
         st.subheader("View Job Details")
         if not jobs_df.empty:
-            job_options = {
-                f"{row['title']} @ {row['company']}": idx
-                for idx, row in jobs_df.iterrows()
-            }
-            selected_label = st.selectbox(
-                "Select a job to view", list(job_options.keys())
+            job_labels = (
+                jobs_df["title"].astype(str) + " @ " + jobs_df["company"].astype(str)
+            )
+            selected_idx = st.selectbox(
+                "Select a job to view",
+                options=jobs_df.index,
+                format_func=lambda idx: job_labels[idx],
             )
-            selected_row = jobs_df.loc[job_options[selected_label]]
+            selected_row = jobs_df.loc[selected_idx]
 
             with st.expander("Job Description"):
                 st.write(selected_row["description"])
 
-            if selected_row["resume_path"] and os.path.exists(
-                str(selected_row["resume_path"])
+            # Resume bytes are only read once the user asks for this job's download
+            job_id = selected_row["id"]
+            if not has_artifact(job_id) and not (
+                selected_row["resume_path"]
+                and os.path.exists(str(selected_row["resume_path"]))
             ):
-                with open(selected_row["resume_path"], "rb") as f:
+                st.caption("No tailored resume saved for this application yet.")
+            elif st.session_state.get("prepared_resume_id") != job_id:
+                if st.button("📄 Prepare Tailored Resume"):
+                    # Re-rendered from the stored change list on a render cache miss
+                    try:
+                        with st.spinner("Preparing tailored resume..."):
+                            prepared = get_job_resume(selected_row.to_dict())
+                    except (FileNotFoundError, RuntimeError) as e:
+                        st.error(f"Could not prepare the tailored resume: {e}")
+                    else:
+                        if prepared is None:
+                            st.error("No tailored resume saved for this application.")
+                        else:
+                            st.session_state["prepared_resume_id"] = job_id
+                            st.session_state["prepared_resume"] = prepared
+                            st.rerun()
+            elif not os.path.exists(st.session_state["prepared_resume"][0]):
+                # The rendered PDF was evicted from the cache since it was prepared
+                _clear_prepared_resume()
+                st.rerun()
+            else:
+                resume_pdf_path, file_name = st.session_state["prepared_resume"]
+                with open(resume_pdf_path, "rb") as f:
                     st.download_button(
                         label="⬇️ Download Tailored Resume",
-                        data=f.read(),
-                        file_name=os.path.basename(selected_row["resume_path"]),
+                        data=f,
+                        file_name=file_name,
                         mime="application/pdf",
+                        on_click=_clear_prepared_resume,
                     )
+
+        st.divider()
+
+        # ── Export ────────────────────────────────────────────────────────────
+        st.subheader("Export Applications")
+        e_col1, e_col2 = st.columns(2)
+        with e_col1:
+            export_statuses = st.multiselect(
+                "Statuses to export", options=JOB_STATUSES, key="export_statuses"
+            )
+        with e_col2:
+            export_dates = st.date_input("Date added range", value=(), key="export_dates")
+
+        if st.button("📦 Build Export"):
+            export_df = select_jobs(
+                statuses=export_statuses,
+                date_range=export_dates if len(export_dates) == 2 else None,
+            )
+            st.session_state.pop("export_download_ready", None)
+            with st.spinner(f"Exporting {len(export_df)} application(s)..."):
+                st.session_state["export_path"] = export_applications(
+                    row._asdict() for row in export_df.itertuples(index=False)
+                )
+
+        # The archive is only read once the user asks to download it
+        export_path = st.session_state.get("export_path")
+        if export_path and not os.path.exists(export_path):
+            _clear_export()
+        elif export_path:
+            st.caption(f"Saved to {export_path}")
+            if not st.session_state.get("export_download_ready"):
+                if st.button("📥 Prepare Export Download"):
+                    st.session_state["export_download_ready"] = True
+                    st.rerun()
             else:
-                st.caption("No tailored resume saved for this application yet.")
+                with open(export_path, "rb") as f:
+                    st.download_button(
+                        label="⬇️ Download Export (.zip)",
+                        data=f,
+                        file_name=os.path.basename(export_path),
+                        mime="application/zip",
+                        on_click=_clear_export,
+                    )
+
+
+def _clear_prepared_resume():
+    st.session_state.pop("prepared_resume_id", None)
+    st.session_state.pop("prepared_resume", None)
+
+
+def _clear_export():
+    st.session_state.pop("export_path", None)
+    st.session_state.pop("export_download_ready", None)
@@ -1,11 +1,22 @@
 import os
+import tempfile
 import streamlit as st
 
 from config import PATHS
 from pdf_tools import display_pdf, docx_to_pdf
+from resume_store import (
+    bytes_hash,
+    file_hash,
+    store_master_version,
+    list_stale_artifacts,
+    retailor_artifacts,
+)
+from resume_tools import extract_resume_text
 
+RESUME_DIR = PATHS["RESUME_DIR"]
 MASTER_RESUME_DOCX_PATH = PATHS["MASTER_RESUME_DOCX_PATH"]
 MASTER_RESUME_PDF_PATH = PATHS["MASTER_RESUME_PDF_PATH"]
+MASTER_RESUME_TXT_PATH = PATHS["MASTER_RESUME_TXT_PATH"]
 
 
 def render():
@@ -14,9 +25,28 @@ def render():
     # Upload section
     uploaded = st.file_uploader("Upload new master resume (.docx)", type=["docx"])
     if uploaded:
-        with open(MASTER_RESUME_DOCX_PATH, "wb") as f:
-            f.write(uploaded.read())
-        st.success("Master resume saved!")
+        docx_bytes = uploaded.getvalue()
+        current_hash = (
+            file_hash(MASTER_RESUME_DOCX_PATH)
+            if os.path.exists(MASTER_RESUME_DOCX_PATH)
+            else None
+        )
+
+        # The uploader keeps its file across reruns, so only act on new content, and
+        # do not retry an upload whose conversion already failed
+        upload_hash = bytes_hash(docx_bytes)
+        if upload_hash not in (current_hash, st.session_state.get("failed_master_hash")):
+            try:
+                with st.spinner("Saving master resume..."):
+                    _replace_master(docx_bytes)
+            except RuntimeError as e:
+                st.session_state["failed_master_hash"] = upload_hash
+                st.error(
+                    "Could not convert the uploaded resume to PDF, so the current "
+                    f"master resume was kept: {e}"
+                )
+            else:
+                st.success("Master resume saved!")
 
     st.divider()
 
@@ -24,11 +54,71 @@ def render():
     if os.path.exists(MASTER_RESUME_DOCX_PATH):
         # Create resume pdf if it does not exist:
         if not os.path.exists(MASTER_RESUME_PDF_PATH):
-            docx_to_pdf(MASTER_RESUME_DOCX_PATH, MASTER_RESUME_PDF_PATH)
+            try:
+                docx_to_pdf(MASTER_RESUME_DOCX_PATH, MASTER_RESUME_PDF_PATH)
+            except RuntimeError as e:
+                st.error(f"Could not convert the master resume to PDF: {e}")
+
+        # ── Re-tailor resumes built on older master versions ──────────────────
+        # Hash the master and scan the artifacts only when the master file changes,
+        # not on every rerun
+        master_mtime = os.stat(MASTER_RESUME_DOCX_PATH).st_mtime_ns
+        if st.session_state.get("master_mtime") != master_mtime:
+            master_hash = store_master_version(MASTER_RESUME_DOCX_PATH)
+            st.session_state["master_mtime"] = master_mtime
+            st.session_state["master_hash"] = master_hash
+            st.session_state["stale_count"] = len(list_stale_artifacts(master_hash))
+
+        master_hash = st.session_state["master_hash"]
+        stale_count = st.session_state["stale_count"]
+        if stale_count:
+            st.info(
+                f"{stale_count} tailored resume(s) were built on an older "
+                "master resume. Re-tailoring keeps each rewrite whose original bullet "
+                "still exists and re-renders the PDFs, without calling the LLM."
+            )
+            if st.button("🔁 Re-tailor Existing Resumes"):
+                with st.spinner("Re-tailoring resumes..."):
+                    summaries = retailor_artifacts(master_hash)
+                st.session_state["stale_count"] = 0
+                st.success(f"Re-tailored {len(summaries)} resume(s).")
+                st.dataframe(summaries, width="stretch", hide_index=True)
 
-        st.subheader("Current Master Resume")
-        master_resume_pdf_display = display_pdf(MASTER_RESUME_PDF_PATH)
-        st.markdown(master_resume_pdf_display, unsafe_allow_html=True)
+        if os.path.exists(MASTER_RESUME_PDF_PATH):
+            st.subheader("Current Master Resume")
+            master_resume_pdf_display = display_pdf(MASTER_RESUME_PDF_PATH)
+            st.markdown(master_resume_pdf_display, unsafe_allow_html=True)
 
     else:
         st.info("No master resume uploaded yet. Use the uploader above to add one.")
+
+
+def _replace_master(docx_bytes: bytes):
+    """
+    Make an uploaded resume the master, converting it to PDF before anything is replaced.
+
+    The new docx and PDF are built next to the current ones and only moved into place once
+    the conversion succeeded, so a failed conversion leaves the old master, PDF and text
+    consistent with each other.
+
+    Args:
+        docx_bytes (bytes): The uploaded .docx file.
+
+    Raises:
+        RuntimeError: If the docx to pdf conversion fails.
+    """
+    fd, new_docx_path = tempfile.mkstemp(suffix=".docx", dir=RESUME_DIR)
+    new_pdf_path = f"{os.path.splitext(new_docx_path)[0]}.pdf"
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(docx_bytes)
+        docx_to_pdf(new_docx_path, new_pdf_path)
+        os.replace(new_pdf_path, MASTER_RESUME_PDF_PATH)
+        os.replace(new_docx_path, MASTER_RESUME_DOCX_PATH)
+    finally:
+        for path in (new_docx_path, new_pdf_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    store_master_version(MASTER_RESUME_DOCX_PATH)
+    extract_resume_text(MASTER_RESUME_PDF_PATH, MASTER_RESUME_TXT_PATH)
@@ -1,7 +1,16 @@
-import pandas as pd
+import math
 import streamlit as st
 
-from config import save_referrals, load_referrals
+from config import (
+    load_referrals,
+    add_referral,
+    update_referrals,
+    select_referrals,
+    paginate,
+    get_row_changes,
+)
+
+PAGE_SIZES = [25, 50, 100, 250]
 
 
 def render():
@@ -12,13 +21,9 @@ def render():
     search = st.text_input(
         "🔍 Search referrals", placeholder="Filter by company, name, or contact..."
     )
-    if search:
-        mask = referrals_df.apply(
-            lambda row: row.astype(str).str.contains(search, case=False).any(), axis=1
-        )
-        display_df = referrals_df[mask].reset_index(drop=True)
-    else:
-        display_df = referrals_df.copy()
+    # Search once; the match count and the page sent to the editor both come from it
+    matched_df = select_referrals(search)
+    matched_count = len(matched_df)
 
     st.divider()
 
@@ -61,10 +66,7 @@ def render():
                     "contact at": r_contact,
                     "notes": r_notes,
                 }
-                referrals_df = pd.concat(
-                    [referrals_df, pd.DataFrame([new_ref])], ignore_index=True
-                )
-                save_referrals(referrals_df)
+                add_referral(new_ref)
                 st.success(f"Referral added: {r_name} @ {r_company}")
                 st.session_state.ref_form_key += 1
                 st.rerun()
@@ -72,12 +74,36 @@ def render():
     st.divider()
 
     # ── Editable table ────────────────────────────────────────────────────────
-    if display_df.empty:
+    if matched_count == 0:
         st.info("No referrals found. Add one using the expander above.")
     else:
-        st.caption(f"Showing {len(display_df)} of {len(referrals_df)} referral(s)")
+        p_col1, p_col2 = st.columns(2)
+        with p_col1:
+            page_size = st.selectbox(
+                "Rows per page", options=PAGE_SIZES, key="ref_page_size"
+            )
+        with p_col2:
+            page_count = max(math.ceil(matched_count / page_size), 1)
+            page = st.number_input(
+                "Page", min_value=1, max_value=page_count, step=1, key="ref_page"
+            )
+
+        # Only the requested page is sent to the editor
+        page_df = paginate(matched_df, "company", page=page, page_size=page_size)
+        display_df = page_df.set_index("id")
 
-        edited_ref_df = st.data_editor(
+        first_row = (page - 1) * page_size + 1
+        last_row = (page - 1) * page_size + len(page_df)
+        st.caption(
+            f"Showing {first_row}–{last_row} of {matched_count} matching "
+            f"({len(referrals_df)} referral(s) in total)"
+        )
+
+        # Edits are tied to the exact page shown, so a new view starts clean
+        view = (search, page_size, page)
+        editor_key = f"referrals_table_{st.session_state.ref_table_key}_{hash(view)}"
+
+        st.data_editor(
             display_df,
             width="stretch",
             hide_index=True,
@@ -90,14 +116,17 @@ def render():
                     "Notes", width="large", required=False, default=""
                 ),
             },
-            key="referrals_table",
+            key=editor_key,
         )
 
         if st.button("💾 Save Changes", key="save_referrals"):
-            if search:
-                # Merge edits back into the full dataframe by index
-                referrals_df.update(edited_ref_df)
-            else:
-                referrals_df = edited_ref_df
-            save_referrals(referrals_df)
-            st.success("Referral database updated!")
+            # Push only the edited, added and deleted rows, keyed by referral id
+            changes = get_row_changes(
+                st.session_state[editor_key], list(display_df.index)
+            )
+            update_referrals(changes)
+            st.session_state["ref_save_success"] = "Referral database updated!"
+            st.session_state.ref_table_key += 1
+            st.rerun()
+        if "ref_save_success" in st.session_state:
+            st.success(st.session_state.pop("ref_save_success"))
@@ -1,13 +1,29 @@
 import os
+import tempfile
 import pandas as pd
 import streamlit as st
 from datetime import date
 
-from config import PATHS, load_jobs, save_jobs
-from styles import score_card_style, keyword_gaps_pill_style, suggestions_style
-from resume_tools import tailor_resume
-from pdf_tools import display_pdf
+from config import PATHS, load_jobs, add_job, add_jobs
+from ingest_tools import (
+    collect_posting_files,
+    extract_posting_zip,
+    parse_postings,
+    dedupe_postings,
+)
+from fetch_tools import fetch_job_description, fetch_job_descriptions
+from styles import (
+    score_card_style,
+    keyword_gaps_pill_style,
+    suggestions_style,
+    word_diff_style,
+    resume_preview_style,
+)
+from resume_tools import ROUTER, tailor_resume
+from resume_store import render_artifact_async, bind_artifact, get_artifact_filename
+from pdf_tools import display_pdf, get_paragraphs
 
+MASTER_RESUME_DOCX_PATH = PATHS["MASTER_RESUME_DOCX_PATH"]
 MASTER_RESUME_PDF_PATH = PATHS["MASTER_RESUME_PDF_PATH"]
 
 
@@ -15,9 +31,108 @@ def render():
     jobs_df = load_jobs()
     st.header("Add Job Description")
 
+    # ── Bulk import ───────────────────────────────────────────────────────────
+    with st.expander("📥 Bulk Import Saved Postings", expanded=False):
+        st.caption(
+            "Import HTML, PDF, TXT or DOCX postings from a local folder or a zip file. "
+            "Duplicates of saved jobs are skipped."
+        )
+        import_dir = st.text_input(
+            "Folder path", placeholder="e.g. C:/Users/me/Downloads/postings"
+        )
+        import_zip = st.file_uploader("...or upload a zip", type=["zip"])
+
+        if st.button("📥 Import Postings"):
+            if import_zip is None and not import_dir:
+                st.error("Please provide a folder or zip file with postings.")
+            elif import_zip is None and not os.path.isdir(import_dir):
+                st.error(f"Folder not found: {import_dir}")
+            else:
+                with st.spinner("Extracting postings..."):
+                    with tempfile.TemporaryDirectory() as tmp_dir:
+                        if import_zip is not None:
+                            paths = extract_posting_zip(import_zip, tmp_dir)
+                        else:
+                            paths = collect_posting_files(import_dir)
+                        postings = parse_postings(paths)
+
+                # Dedupe against saved jobs, then insert everything in one write
+                new_postings = dedupe_postings(postings, jobs_df["description"])
+                job_ids = []
+                if new_postings:
+                    job_ids = add_jobs(
+                        [
+                            {
+                                "company": posting["company"],
+                                "title": posting["title"],
+                                "description": posting["description"],
+                                "status": "Applied",
+                                "date_added": date.today(),
+                                "resume_path": "",
+                                "url": posting["url"],
+                            }
+                            for posting in new_postings
+                        ]
+                    )
+                errors = [p["error"] for p in postings if p["error"]]
+                st.success(
+                    f"Imported {len(job_ids)} new job(s) from {len(paths)} file(s); "
+                    f"{len(paths) - len(job_ids) - len(errors)} duplicate(s) or empty "
+                    "file(s) skipped."
+                )
+                for error in errors:
+                    st.warning(error)
+
+        import_urls = st.text_area(
+            "...or paste posting URLs, one per line",
+            placeholder="https://...",
+            height=100,
+        )
+        if st.button("🌐 Fetch URLs"):
+            urls = import_urls.splitlines()
+            if not any(u.strip() for u in urls):
+                st.error("Please paste at least one URL.")
+            else:
+                with st.spinner("Fetching postings..."):
+                    postings = fetch_job_descriptions(urls)
+
+                new_postings = dedupe_postings(postings, jobs_df["description"])
+                job_ids = []
+                if new_postings:
+                    job_ids = add_jobs(
+                        [
+                            {
+                                "company": posting["company"],
+                                "title": posting["title"],
+                                "description": posting["description"],
+                                "status": "Applied",
+                                "date_added": date.today(),
+                                "resume_path": "",
+                                "url": posting["url"],
+                            }
+                            for posting in new_postings
+                        ]
+                    )
+                errors = [p["error"] for p in postings if p["error"]]
+                st.success(
+                    f"Imported {len(job_ids)} new job(s) from {len(postings)} URL(s); "
+                    f"{len(postings) - len(job_ids) - len(errors)} duplicate(s) or empty "
+                    "page(s) skipped."
+                )
+                for error in errors:
+                    st.warning(error)
+
     if not os.path.exists(MASTER_RESUME_PDF_PATH):
         st.warning("⚠️ Please upload a master resume first (Tab 1) before adding jobs.")
     else:
+        # Fill the form from a fetched posting before its widgets are created
+        fetched = st.session_state.pop("fetched_job", None)
+        if fetched:
+            form_key = st.session_state.job_form_key
+            for field in ("title", "company", "description"):
+                if fetched[field]:
+                    st.session_state[f"{field}_{form_key}"] = fetched[field]
+
         col1, col2 = st.columns(2)
         with col1:
             title = st.text_input(
@@ -33,11 +148,24 @@ def render():
                 key=f"company_{st.session_state.job_form_key}",
             )
 
-        url = st.text_input(
-            "Job Description URL",
-            placeholder="Paste the job url here...",
-            key=f"url_{st.session_state.job_form_key}",
-        )
+        url_col, fetch_col = st.columns([4, 1], vertical_alignment="bottom")
+        with url_col:
+            url = st.text_input(
+                "Job Description URL",
+                placeholder="Paste the job url here...",
+                key=f"url_{st.session_state.job_form_key}",
+            )
+        with fetch_col:
+            if st.button("🌐 Fetch", width="stretch", disabled=not url):
+                with st.spinner("Fetching posting..."):
+                    posting = fetch_job_description(url)
+                if posting["error"]:
+                    st.session_state["fetch_error"] = posting["error"]
+                else:
+                    st.session_state["fetched_job"] = posting
+                st.rerun()
+        if "fetch_error" in st.session_state:
+            st.error(st.session_state.pop("fetch_error"))
 
         description = st.text_area(
             "Job Description",
@@ -46,8 +174,6 @@ def render():
             key=f"description_{st.session_state.job_form_key}",
         )
 
-        job_id = int(jobs_df["id"].max()) + 1 if not jobs_df.empty else 1
-
         st.divider()
 
         # ── Save Job ──────────────────────────────────────────────────────────
@@ -59,7 +185,6 @@ def render():
                     st.error("Please fill in all fields before saving.")
                 else:
                     new_row = {
-                        "id": job_id,
                         "company": company,
                         "title": title,
                         "description": description,
@@ -68,13 +193,22 @@ def render():
                         "resume_path": "",
                         "url": url,
                     }
-                    jobs_df = pd.concat(
-                        [jobs_df, pd.DataFrame([new_row])], ignore_index=True
-                    )
-                    save_jobs(jobs_df)
-                    st.session_state["save_success"] = (
-                        f"Job #{job_id} — {title} @ {company} saved!"
-                    )
+                    job_id = add_job(new_row)
+                    saved = f"Job #{job_id} — {title} @ {company} saved!"
+
+                    # A resume tailored for this posting is only stored once its job exists
+                    artifact = st.session_state.get("tailored_artifact")
+                    if (
+                        artifact is not None
+                        and artifact["job_id"] is None
+                        and st.session_state.get("tailored_description") == description
+                    ):
+                        st.session_state["tailored_artifact"] = bind_artifact(
+                            {**artifact, "company": company, "title": title}, job_id
+                        )
+                        saved = f"{saved} Tailored resume attached."
+
+                    st.session_state["save_success"] = saved
                     st.session_state.job_form_key += 1
                     st.rerun()
         if "save_success" in st.session_state:
@@ -86,19 +220,27 @@ def render():
                 if not company or not title or not description:
                     st.error("Please fill in all fields before tailoring.")
                 else:
-                    with st.spinner("Tailoring resume..."):
-                        score_json, changes_list, tailored_resume_path = tailor_resume(
-                            description, job_id, company, title
-                        )
+                    try:
+                        with st.spinner("Tailoring resume..."):
+                            score_json, artifact = tailor_resume(
+                                description, company, title
+                            )
+                    except (ValueError, RuntimeError, FileNotFoundError) as e:
+                        # No usable score, every model in a tier failed, or no master docx
+                        st.error(f"Tailoring failed: {e}")
+                    else:
                         st.session_state["score_json"] = score_json
-                        st.session_state["changes_list"] = changes_list
-                        st.session_state["tailored_resume_path"] = tailored_resume_path
+                        st.session_state["changes_list"] = artifact["changes"]
+                        st.session_state["tailored_artifact"] = artifact
+                        st.session_state["tailored_description"] = description
+                        st.session_state.pop("render_future", None)
+                        st.session_state.pop("tailored_pdf_path", None)
 
         if "score_json" in st.session_state and "changes_list" in st.session_state:
             st.divider()
             score_json = st.session_state["score_json"]
             changes_list = st.session_state["changes_list"]
-            tailored_resume_path = st.session_state["tailored_resume_path"]
+            tailored_artifact = st.session_state["tailored_artifact"]
 
             origial_score = int(score_json["score"])
             score_rationale = score_json["scoreRationale"]
@@ -129,18 +271,101 @@ def render():
             st.markdown("<br>", unsafe_allow_html=True)
 
             # ── Rewritten Bullet Points ───────────────────────────────────────
-            if changes_list and tailored_resume_path:
+            if changes_list:
                 st.markdown("#### ✏️ Rewritten Bullet Points")
-                master_resume_col, edited_resume_col = st.columns([1, 1])
+                view = st.radio("Preview", ["Side by side", "Inline"], horizontal=True)
 
-                with master_resume_col:
-                    st.markdown("##### Original Resume")
+                # Instant HTML preview from the master's paragraphs, no PDF conversion
+                if view == "Side by side":
+                    paragraphs = get_paragraphs(MASTER_RESUME_DOCX_PATH)
+                    master_resume_col, edited_resume_col = st.columns([1, 1])
 
-                    pdf_display_master_resume = display_pdf(MASTER_RESUME_PDF_PATH)
-                    st.markdown(pdf_display_master_resume, unsafe_allow_html=True)
+                    with master_resume_col:
+                        st.markdown("##### Original Resume")
+                        st.markdown(
+                            resume_preview_style(paragraphs, changes_list, edited=False),
+                            unsafe_allow_html=True,
+                        )
 
-                with edited_resume_col:
-                    st.markdown("##### Edited Resume")
+                    with edited_resume_col:
+                        st.markdown("##### Edited Resume")
+                        st.markdown(
+                            resume_preview_style(paragraphs, changes_list, edited=True),
+                            unsafe_allow_html=True,
+                        )
+                else:
+                    for change in changes_list:
+                        before, after = word_diff_style(
+                            change.get("original", ""), change.get("rewritten", "")
+                        )
+                        st.markdown(
+                            suggestions_style(before, after), unsafe_allow_html=True
+                        )
 
-                    pdf_display_edited_resume = display_pdf(tailored_resume_path)
-                    st.markdown(pdf_display_edited_resume, unsafe_allow_html=True)
+                # ── Tailored PDF ──────────────────────────────────────────────
+                if st.button("📄 Render PDF"):
+                    st.session_state.pop("tailored_pdf_path", None)
+                    st.session_state["render_future"] = render_artifact_async(
+                        tailored_artifact
+                    )
+                if "render_future" in st.session_state:
+                    _render_pdf_status()
+                elif "render_error" in st.session_state:
+                    st.error(
+                        f"PDF rendering failed: {st.session_state.pop('render_error')}"
+                    )
+                elif "tailored_pdf_path" in st.session_state:
+                    tailored_resume_path = st.session_state["tailored_pdf_path"]
+                    with open(tailored_resume_path, "rb") as f:
+                        st.download_button(
+                            label="⬇️ Download Tailored Resume",
+                            data=f.read(),
+                            file_name=get_artifact_filename(tailored_artifact),
+                            mime="application/pdf",
+                        )
+                    with st.expander("View PDF"):
+                        st.markdown(
+                            display_pdf(tailored_resume_path), unsafe_allow_html=True
+                        )
+
+            # ── Model usage ───────────────────────────────────────────────────
+            with st.expander("📊 Model Usage"):
+                usage = pd.DataFrame.from_dict(ROUTER.stats(), orient="index")
+                usage.index.name = "Model"
+                st.dataframe(
+                    usage,
+                    width="stretch",
+                    column_config={
+                        "calls": st.column_config.NumberColumn("Calls"),
+                        "errors": st.column_config.NumberColumn("Errors"),
+                        "avg_latency": st.column_config.NumberColumn(
+                            "Avg Latency (s)", format="%.2f"
+                        ),
+                        "tokens": st.column_config.NumberColumn("Tokens"),
+                        "cost": st.column_config.NumberColumn(
+                            "Cost (USD)", format="$%.4f"
+                        ),
+                    },
+                )
+
+
+@st.fragment(run_every=1)
+def _render_pdf_status():
+    """Poll the background PDF render and rerun the page once it has finished."""
+    render_future = st.session_state["render_future"]
+    if not render_future.done():
+        st.caption("⏳ Rendering tailored PDF in the background...")
+        return
+
+    # Clear the future first, so a failed render is reported once instead of every second
+    del st.session_state["render_future"]
+    try:
+        pdf_path = render_future.result()
+    except Exception as e:
+        st.session_state["render_error"] = str(e)
+    else:
+        if pdf_path is None:
+            st.session_state["render_error"] = "No tailored resume to render."
+        else:
+            st.session_state["tailored_pdf_path"] = pdf_path
+    st.rerun()
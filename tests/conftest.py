@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the storage layer at an empty data directory."""
+    for name in (
+        "jobs_csv",
+        "referrals_csv",
+        "job_stats_json",
+        "jobs_fts_db",
+        "row_ids_json",
+    ):
+        path = tmp_path / os.path.basename(getattr(config, name))
+        monkeypatch.setattr(config, name, str(path))
+    monkeypatch.setattr(config, "artifacts_dir", str(tmp_path / "artifacts"))
+    os.makedirs(config.artifacts_dir)
+    monkeypatch.setattr(config, "_table_cache", {})
+    return tmp_path
@@ -0,0 +1,89 @@
+import os
+from datetime import date
+
+import config
+
+
+def _job(company: str, title: str, description: str = "") -> dict:
+    return {
+        "company": company,
+        "title": title,
+        "description": description or f"{title} at {company}",
+        "status": "Applied",
+        "date_added": date(2024, 1, 1),
+        "resume_path": "",
+        "url": "",
+    }
+
+
+def _changes(edited=None, added=None, deleted=None) -> dict:
+    return {"edited": edited or {}, "added": added or [], "deleted": deleted or []}
+
+
+def test_deleted_job_ids_are_not_reused(data_dir):
+    ids = config.add_jobs([_job("C0", "A"), _job("C1", "B"), _job("C2", "C")])
+    assert ids == [1, 2, 3]
+
+    config.update_jobs(_changes(deleted=[3]))
+    assert config.add_job(_job("C3", "D")) == 4
+
+
+def test_deleted_referral_ids_are_not_reused(data_dir):
+    first = config.add_referral({"company": "C0", "referral_name": "A"})
+    second = config.add_referral({"company": "C1", "referral_name": "B"})
+
+    config.update_referrals(_changes(deleted=[second], added=[{"company": "C2"}]))
+    assert sorted(config.load_referrals()["id"]) == [first, second + 1]
+
+
+def test_select_and_paginate_jobs(data_dir):
+    config.add_jobs([_job(f"C{i % 2}", f"T{i}") for i in range(5)])
+
+    matched_df = config.select_jobs(companies=["C0"])
+    assert len(matched_df) == 3
+
+    page_df = config.paginate(matched_df, "title", ascending=False, page=2, page_size=2)
+    assert list(page_df["title"]) == ["T0"]
+
+
+def test_delete_and_add_in_one_save_updates_aggregates(data_dir):
+    config.add_jobs([_job(f"C{i}", f"T{i}") for i in range(4)])
+    config.update_jobs(_changes(deleted=[4]))
+
+    config.update_jobs(
+        _changes(deleted=[3], added=[{"company": "C9", "title": "NEW"}])
+    )
+
+    stats = config.load_job_stats()
+    assert stats["by_company"] == {"C0": 1, "C1": 1, "C9": 1}
+    assert stats["by_status"] == {"Applied": 3}
+    assert stats == config.rebuild_job_stats()
+
+
+def test_deleting_a_job_deletes_its_tailored_resume(data_dir):
+    config.add_jobs([_job("C0", "A"), _job("C1", "B")])
+    for job_id in (1, 2):
+        with open(config.get_artifact_path(job_id), "w") as f:
+            f.write("{}")
+
+    config.update_jobs(_changes(deleted=[2]))
+
+    assert os.path.exists(config.get_artifact_path(1))
+    assert not os.path.exists(config.get_artifact_path(2))
+
+
+def test_delete_and_add_in_one_save_is_searchable(data_dir):
+    config.add_jobs([_job(f"C{i}", f"T{i}") for i in range(4)])
+    config.update_jobs(_changes(deleted=[4]))
+
+    config.update_jobs(
+        _changes(
+            deleted=[3],
+            added=[{"company": "C9", "title": "NEW", "description": "Rust compilers"}],
+        )
+    )
+
+    results_df = config.search_jobs("NEW")
+    assert list(results_df["id"]) == [5]
+    assert list(config.search_jobs("rust")["id"]) == [5]
+    assert config.search_jobs("T2").empty
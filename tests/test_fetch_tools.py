@@ -0,0 +1,107 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import fetch_tools
+
+PAGE = b"""<html><head><title>Data Scientist - Acme | LinkedIn</title></head>
+<body><nav>Jobs Home</nav><div><p>Build models.</p><p>Python &amp; SQL.</p></div>
+<script>track()</script></body></html>"""
+ETAG = '"v1"'
+
+
+class _PostingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Serve a job posting from a local stand-in server with an empty fetch cache."""
+    monkeypatch.setattr(fetch_tools, "FETCH_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(fetch_tools._domain_limiter, "delay", 0)
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _PostingHandler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(httpd, path: str = "/job") -> str:
+    return f"http://127.0.0.1:{httpd.server_port}{path}"
+
+
+def test_fetch_extracts_the_posting(server):
+    posting = fetch_tools.fetch_job_description(_url(server))
+
+    assert posting["error"] is None
+    assert posting["from_cache"] is False
+    assert (posting["title"], posting["company"]) == ("Data Scientist", "Acme")
+    assert posting["description"] == "Build models.\n\nPython & SQL."
+
+
+def test_fresh_cache_skips_the_network(server):
+    fetch_tools.fetch_job_description(_url(server))
+
+    posting = fetch_tools.fetch_job_description(_url(server))
+
+    assert posting["from_cache"] is True
+    assert len(server.requests) == 1
+
+
+def test_stale_cache_is_revalidated_with_etag(server, monkeypatch):
+    fetch_tools.fetch_job_description(_url(server))
+    monkeypatch.setattr(fetch_tools, "CACHE_FRESH_SECONDS", 0)
+
+    posting = fetch_tools.fetch_job_description(_url(server))
+
+    assert posting["from_cache"] is True
+    assert posting["title"] == "Data Scientist"
+    assert server.requests == [("/job", None), ("/job", ETAG)]
+
+
+def test_stale_cache_is_served_when_the_server_is_down(server, monkeypatch):
+    url = _url(server)
+    fetch_tools.fetch_job_description(url)
+    server.shutdown()
+    server.server_close()
+    monkeypatch.setattr(fetch_tools, "CACHE_FRESH_SECONDS", 0)
+
+    # A session without retries keeps the failure fast
+    posting = fetch_tools.fetch_job_description(url, session=requests.Session())
+
+    assert posting["error"] is None
+    assert posting["from_cache"] is True
+    assert posting["title"] == "Data Scientist"
+
+    missing = fetch_tools.fetch_job_description(
+        url + "?never-cached", session=requests.Session()
+    )
+    assert missing["error"].startswith("Could not fetch")
+
+
+def test_batch_fetch_dedupes_and_keeps_order(server):
+    urls = [_url(server, f"/p{i}") for i in range(3)]
+
+    postings = fetch_tools.fetch_job_descriptions(urls + [urls[0], "  ", ""])
+
+    assert [p["url"] for p in postings] == urls
+    assert sorted(path for path, _ in server.requests) == ["/p0", "/p1", "/p2"]
@@ -0,0 +1,128 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from ingest_tools import (
+    _split_title,
+    clean_text,
+    collect_posting_files,
+    dedupe_postings,
+    extract_posting_zip,
+    parse_posting,
+    parse_posting_html,
+)
+
+PAGE = """<html><head>
+<title>ignored - Other | Indeed</title>
+<meta property="og:title" content="Data Scientist - Acme | LinkedIn">
+<link rel="canonical" href="https://example.com/jobs/1">
+<style>.job { color: red }</style>
+</head><body>
+<header>Sign in</header><nav><a>Jobs</a><a>People</a></nav>
+<h1>Data Scientist</h1><div><p>Build models.</p><p>Python &amp;&nbsp;SQL.</p></div>
+<form><input value="Apply"></form>
+<script>track("view")</script><noscript>Enable JavaScript</noscript>
+<footer>© LinkedIn</footer>
+</body></html>"""
+
+
+def _posting(description, error=None, title="Engineer"):
+    return {"title": title, "description": description, "error": error}
+
+
+def test_html_posting_skips_page_chrome():
+    posting = parse_posting_html(PAGE)
+
+    assert posting["title"] == "Data Scientist"
+    assert posting["company"] == "Acme"
+    assert posting["url"] == "https://example.com/jobs/1"
+    assert clean_text(posting["description"]) == (
+        "Data Scientist\n\nBuild models.\n\nPython & SQL."
+    )
+
+
+def test_html_posting_falls_back_to_page_title_and_site_name():
+    page = (
+        '<html><head><title>Backend Engineer</title>'
+        '<meta property="og:site_name" content="Globex"></head>'
+        "<body><p>Write Go.</p></body></html>"
+    )
+
+    posting = parse_posting_html(page)
+
+    assert (posting["title"], posting["company"]) == ("Backend Engineer", "Globex")
+    assert posting["url"] == ""
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Data Scientist - Acme | LinkedIn", ("Data Scientist", "Acme")),
+        ("Staff Engineer at Initech", ("Staff Engineer", "Initech")),
+        ("ML Engineer @ Hooli — Greenhouse", ("ML Engineer", "Hooli")),
+        ("Front-end Developer", ("Front-end Developer", "")),
+        ("LinkedIn", ("", "")),
+        ("", ("", "")),
+    ],
+)
+def test_split_title(text, expected):
+    assert _split_title(text) == expected
+
+
+def test_dedupe_drops_failed_empty_and_repeated_postings():
+    postings = [
+        _posting("Build  models.\nPython"),
+        _posting("build models. python", title="Same text, other spacing"),
+        _posting("Already tracked"),
+        _posting(""),
+        _posting("", error="Could not read broken.pdf"),
+        _posting("Write Go."),
+    ]
+
+    unique = dedupe_postings(postings, ["ALREADY   tracked", None, ""])
+
+    assert [p["description"] for p in unique] == ["Build  models.\nPython", "Write Go."]
+
+
+def test_zip_entries_cannot_escape_destination(tmp_path):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("../x.txt", "escaped")
+        archive.writestr("a/posting.txt", "first")
+        archive.writestr("b/posting.txt", "second")
+        archive.writestr("notes.md", "not a posting")
+        archive.writestr("folder/", "")
+    destination = tmp_path / "extracted"
+    destination.mkdir()
+
+    paths = extract_posting_zip(buffer, str(destination))
+
+    assert not (tmp_path / "x.txt").exists()
+    root = os.path.realpath(destination)
+    assert all(os.path.commonpath([root, os.path.realpath(p)]) == root for p in paths)
+    assert [os.path.basename(p) for p in paths] == ["x.txt", "posting.txt", "posting.txt"]
+    assert [open(p).read() for p in paths] == ["escaped", "first", "second"]
+    assert collect_posting_files(str(destination)) == sorted(paths)
+
+
+def test_text_posting_takes_title_from_file_name(tmp_path):
+    path = tmp_path / "Data_Scientist - Acme.txt"
+    path.write_text("Build   models.\n\n\n\nShip them.")
+
+    posting = parse_posting(str(path))
+
+    assert posting["error"] is None
+    assert (posting["title"], posting["company"]) == ("Data Scientist", "Acme")
+    assert posting["description"] == "Build models.\n\nShip them."
+
+
+def test_unreadable_posting_reports_error(tmp_path):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"not a pdf")
+
+    posting = parse_posting(str(path))
+
+    assert posting["error"].startswith("Could not read broken.pdf")
+    assert posting["description"] == ""
@@ -0,0 +1,91 @@
+import pytest
+
+from json_tools import (
+    SCORE_SCHEMA,
+    CHANGE_SCHEMA,
+    parse_llm_json,
+    repair_json,
+    validate_object,
+    validate_list,
+)
+
+SCORE = (
+    '{"score": 72, "scoreRationale": "Good fit.", "keywordGaps": ["Go"], '
+    '"visaSponsorship": true}'
+)
+CHANGES = (
+    '{"changes": [{"original": "A", "rewritten": "A2"}, '
+    '{"original": "B", "rewritten": "B2"}]}'
+)
+
+
+def test_plain_json():
+    assert parse_llm_json(SCORE)["score"] == 72
+
+
+def test_trailing_note_keeps_every_item():
+    data = parse_llm_json(CHANGES + "\nLet me know if you want more changes, {name}!")
+
+    assert [c["original"] for c in validate_list(data, CHANGE_SCHEMA)] == ["A", "B"]
+
+
+def test_trailing_note_keeps_every_field():
+    data = parse_llm_json(SCORE + "\n(Scores are approximate.)")
+
+    valid, missing = validate_object(data, SCORE_SCHEMA)
+    assert missing == []
+    assert valid["visaSponsorship"] is True
+
+
+def test_braces_in_leading_prose_are_skipped():
+    assert parse_llm_json('Note: use {curly} braces. {"score": 50}') == {"score": 50}
+
+
+def test_fenced_json():
+    assert parse_llm_json(f"Here you go:\n```json\n{SCORE}\n```\nThanks") == (
+        parse_llm_json(SCORE)
+    )
+
+
+def test_truncated_list_drops_only_the_incomplete_item():
+    data = parse_llm_json(CHANGES[: CHANGES.index('"B2"') - 2])
+
+    assert validate_list(data, CHANGE_SCHEMA) == [{"original": "A", "rewritten": "A2"}]
+
+
+def test_truncated_string_is_closed():
+    assert repair_json('{"scoreRationale": "Strong Python backgr') == {
+        "scoreRationale": "Strong Python backgr"
+    }
+
+
+def test_trailing_commas():
+    assert repair_json('{"keywordGaps": ["Go", "Rust",],}') == {
+        "keywordGaps": ["Go", "Rust"]
+    }
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        parse_llm_json("I cannot score this resume.")
+
+
+def test_validate_object_coerces_llm_type_slips():
+    valid, missing = validate_object(
+        {"score": "85%", "visaSponsorship": "No", "keywordGaps": "Go"}, SCORE_SCHEMA
+    )
+
+    assert valid == {"score": 85.0, "visaSponsorship": False}
+    assert missing == ["scoreRationale", "keywordGaps"]
+
+
+def test_validate_list_keeps_ids_and_drops_malformed_items():
+    data = [
+        {"id": 4, "original": "A", "rewritten": "A2"},
+        {"original": "B"},
+        "not an object",
+    ]
+
+    assert validate_list(data, CHANGE_SCHEMA) == [
+        {"id": 4, "original": "A", "rewritten": "A2"}
+    ]
@@ -0,0 +1,98 @@
+from itertools import repeat
+
+import pytest
+from langchain_core.language_models.fake_chat_models import (
+    FakeListChatModel,
+    GenericFakeChatModel,
+)
+from langchain_core.messages import AIMessage
+
+import model_router
+from model_router import ModelRouter, FAILURE_COOLDOWN
+
+TEMPLATE = "Score {resume} against {jd}"
+VARIABLES = {"resume": "resume", "jd": "jd"}
+
+
+class FailingChatModel(FakeListChatModel):
+    def _call(self, *args, **kwargs):
+        raise RuntimeError("rate limited")
+
+
+def _stub(name: str, content: str, tokens: int = 1000) -> GenericFakeChatModel:
+    message = AIMessage(
+        content=content,
+        usage_metadata={
+            "input_tokens": tokens,
+            "output_tokens": 0,
+            "total_tokens": tokens,
+        },
+    )
+    return GenericFakeChatModel(messages=repeat(message), name=name)
+
+
+def test_failing_model_falls_through_and_is_demoted():
+    failing = FailingChatModel(responses=[], name="flaky")
+    router = ModelRouter({"fast": [failing, _stub("steady", "ok")]})
+
+    assert router.invoke("fast", TEMPLATE, VARIABLES) == "ok"
+    assert [m.name for m in router.ranked("fast")] == ["steady", "flaky"]
+
+    stats = router.stats()
+    assert stats["flaky"]["errors"] == 1
+    assert stats["steady"]["calls"] == 1
+
+
+def test_failed_model_recovers_after_its_cooldown(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(model_router.time, "monotonic", lambda: now[0])
+    failing = FailingChatModel(responses=[], name="flaky")
+    router = ModelRouter(
+        {"fast": [failing, _stub("steady", "ok")]}, costs={"flaky": 0.06, "steady": 0.7}
+    )
+
+    router.invoke("fast", TEMPLATE, VARIABLES)
+    assert [m.name for m in router.ranked("fast")] == ["steady", "flaky"]
+
+    # The cheaper model gets another chance once the cooldown is over
+    now[0] += FAILURE_COOLDOWN + 1
+    assert [m.name for m in router.ranked("fast")] == ["flaky", "steady"]
+
+    # A second failure in a row doubles the cooldown
+    router.invoke("fast", TEMPLATE, VARIABLES)
+    now[0] += FAILURE_COOLDOWN + 1
+    assert [m.name for m in router.ranked("fast")] == ["steady", "flaky"]
+    now[0] += FAILURE_COOLDOWN
+    assert [m.name for m in router.ranked("fast")] == ["flaky", "steady"]
+
+
+def test_cheaper_model_is_preferred_before_either_is_measured():
+    pricey, cheap = _stub("pricey", "a"), _stub("cheap", "b")
+    router = ModelRouter(
+        {"fast": [pricey, cheap]}, costs={"pricey": 0.70, "cheap": 0.06}
+    )
+
+    assert router.invoke("fast", TEMPLATE, VARIABLES) == "b"
+    assert router.invoke("fast", TEMPLATE, VARIABLES) == "b"
+
+    stats = router.stats()
+    assert stats["cheap"]["cost"] == pytest.approx(2 * 1000 * 0.06 / 1_000_000)
+    assert "pricey" not in stats
+
+
+def test_untried_model_is_measured_before_an_equally_priced_one():
+    first, second = _stub("first", "a"), _stub("second", "b")
+    router = ModelRouter({"fast": [first, second]})
+
+    assert router.invoke("fast", TEMPLATE, VARIABLES) == "a"
+    assert router.invoke("fast", TEMPLATE, VARIABLES) == "b"
+
+
+def test_all_models_failing_raises():
+    router = ModelRouter({"strong": [FailingChatModel(responses=[], name="down")]})
+
+    with pytest.raises(RuntimeError, match="down: rate limited"):
+        router.invoke("strong", TEMPLATE, VARIABLES)
+
+    with pytest.raises(ValueError):
+        router.ranked("missing")
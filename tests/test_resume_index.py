@@ -0,0 +1,53 @@
+from resume_index import build_resume_index, select_resume_context
+
+
+def _outline(*paragraphs) -> list[dict]:
+    return [
+        {"text": text, "style": style, "list_item": style == "List Bullet"}
+        for text, style in paragraphs
+    ]
+
+
+SAMPLE = _outline(
+    ("JANE DOE", "Title"),
+    ("jane@example.com | github.com/jane", "Normal"),
+    ("EXPERIENCE", "Heading 1"),
+    ("Senior Engineer, Acme — 2020–2024", "Normal"),
+    ("Led migration of CI to GitHub Actions reducing build time 40%", "List Bullet"),
+    ("Mentored 5 engineers", "List Bullet"),
+    ("Built a Kafka ingestion service handling 2M events per day.", "List Bullet"),
+    ("SKILLS", "Heading 1"),
+    ("Python, Go, Kubernetes", "Normal"),
+)
+
+
+def test_short_list_paragraphs_are_bullets():
+    index = build_resume_index(SAMPLE)
+
+    assert index["bullet_ids"] == [4, 5, 6]
+    assert index["standalone_ids"] == [8]
+    assert [i["context"] for i in index["items"] if i["kind"] == "bullet"] == [3, 3, 3]
+
+
+def test_all_caps_name_stays_in_header():
+    index = build_resume_index(SAMPLE)
+
+    assert index["header"] == ["JANE DOE", "jane@example.com | github.com/jane"]
+
+
+def test_resume_without_list_markup_keeps_every_body_line_rankable():
+    plain = [{"text": p["text"]} for p in SAMPLE]
+
+    index = build_resume_index(plain)
+
+    assert {4, 5, 6} <= set(index["bullet_ids"])
+
+
+def test_selected_context_tags_short_bullets():
+    context = select_resume_context(
+        build_resume_index(SAMPLE), "CI/CD with GitHub Actions and mentoring engineers"
+    )
+
+    assert "[4] Led migration of CI" in context
+    assert "[5] Mentored 5 engineers" in context
+    assert context.startswith("JANE DOE")
@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+import sys
+import types
+import zipfile
+
+import pytest
+
+# pdf_tools drives Word through pywin32/docx2pdf, which only exist on Windows and macOS;
+# conversions are replaced below, so empty stand-ins are enough for the import
+sys.modules.setdefault("pythoncom", types.ModuleType("pythoncom"))
+sys.modules.setdefault("docx2pdf", types.SimpleNamespace(convert=None))
+
+import resume_store  # noqa: E402
+
+
+@pytest.fixture
+def fake_render(data_dir, monkeypatch):
+    """Render artifacts to small fake PDFs; artifacts against "broken" fail to convert."""
+
+    def render(artifact):
+        if artifact["master_hash"] == "broken":
+            raise RuntimeError("Word is not available")
+        pdf_path = data_dir / f"render_{artifact['job_id']}.pdf"
+        pdf_path.write_bytes(f"%PDF job {artifact['job_id']}".encode())
+        return str(pdf_path)
+
+    monkeypatch.setattr(resume_store, "render_artifact", render)
+    return data_dir
+
+
+def _job(job_id, company, title, resume_path=""):
+    return {
+        "id": job_id,
+        "company": company,
+        "title": title,
+        "status": "Applied",
+        "date_added": f"2026-01-{job_id:02d}",
+        "url": f"https://example.com/{job_id}",
+        "resume_path": resume_path,
+        "description": f"Description {job_id}",
+    }
+
+
+def test_export_writes_resumes_and_both_manifests(fake_render):
+    resume_store.save_artifact(1, "acme", "engineer", "v1", [])
+    resume_store.save_artifact(2, "globex", "analyst", "broken", [])
+    legacy_a = fake_render / "a"
+    legacy_b = fake_render / "b"
+    legacy_a.mkdir()
+    legacy_b.mkdir()
+    (legacy_a / "resume.pdf").write_bytes(b"%PDF legacy a")
+    (legacy_b / "resume.pdf").write_bytes(b"%PDF legacy b")
+    jobs = [
+        _job(1, "acme", "engineer"),
+        _job(2, "globex", "analyst"),
+        _job(3, "initech", "developer", str(legacy_a / "resume.pdf")),
+        _job(4, "hooli", "developer", str(legacy_b / "resume.pdf")),
+        _job(5, "umbrella", "chemist"),
+    ]
+
+    zip_path = resume_store.export_applications(
+        iter(jobs), zip_path=str(fake_render / "export.zip")
+    )
+
+    with zipfile.ZipFile(zip_path) as archive:
+        assert sorted(archive.namelist()) == [
+            "manifest.csv",
+            "manifest.json",
+            "resumes/001_acme_engineer.pdf",
+            "resumes/resume.pdf",
+            "resumes/resume_2.pdf",
+        ]
+        assert archive.read("resumes/001_acme_engineer.pdf") == b"%PDF job 1"
+        assert archive.read("resumes/resume.pdf") == b"%PDF legacy a"
+        assert archive.read("resumes/resume_2.pdf") == b"%PDF legacy b"
+
+        csv_rows = list(
+            csv.DictReader(io.StringIO(archive.read("manifest.csv").decode()))
+        )
+        json_rows = json.loads(archive.read("manifest.json"))
+
+    assert csv_rows == json_rows
+    assert list(csv_rows[0]) == resume_store.MANIFEST_COLUMNS
+    assert [row["id"] for row in csv_rows] == ["1", "2", "3", "4", "5"]
+    # A failed render or a job without a resume is still listed, without a file
+    assert [row["resume_file"] for row in csv_rows] == [
+        "resumes/001_acme_engineer.pdf",
+        "",
+        "resumes/resume.pdf",
+        "resumes/resume_2.pdf",
+        "",
+    ]
+    assert csv_rows[0]["description"] == "Description 1"
+
+
+def test_export_with_no_jobs_has_empty_manifests(fake_render):
+    zip_path = resume_store.export_applications([], zip_path=str(fake_render / "empty.zip"))
+
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.namelist() == ["manifest.csv", "manifest.json"]
+        assert archive.read("manifest.csv").decode().strip() == ",".join(
+            resume_store.MANIFEST_COLUMNS
+        )
+        assert json.loads(archive.read("manifest.json")) == []